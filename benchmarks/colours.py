@@ -0,0 +1,46 @@
+#!/bin/python3
+"""
+How much converting a colour costs on every drawing call.
+
+Times colour_to_int and colour_to_str for named, tuple and integer colours, once
+parsing every call as they did before colours were cached ("uncached") and once
+through the cache and the tables of constants.colour_list ("cached"). Pure Python,
+so it runs anywhere:
+
+    PYTHONPATH=. python benchmarks/colours.py [calls]
+"""
+import sys
+from timeit import timeit
+from turtle_oxford import *
+from turtle_oxford import _parse_colour, _int_to_str
+
+calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+
+def uncached_to_int(colour):
+    if isinstance(colour, int):
+        return colour
+    return _parse_colour.__wrapped__(colour)
+
+
+def uncached_to_str(colour):
+    if isinstance(colour, str):
+        return colour
+    return _int_to_str.__wrapped__(uncached_to_int(colour))
+
+
+cases = [
+    ("named colour to int", "cornflowerblue", uncached_to_int, colour_to_int),
+    ("tuple colour to int", (100, 149, 237), uncached_to_int, colour_to_int),
+    ("tuple colour to str", (100, 149, 237), uncached_to_str, colour_to_str),
+    ("colour_list int to str", colour_list[7], uncached_to_str, colour_to_str),
+    ("other int to str", 0x6495ED, uncached_to_str, colour_to_str),
+]
+
+print(f"{'':24}{'uncached':>14}{'cached':>14}")
+for name, value, before, after in cases:
+    times = [
+        timeit(lambda: convert(value), number=calls) / calls * 1e9
+        for convert in (before, after)
+    ]
+    print(f"{name:24}{times[0]:11.0f} ns{times[1]:11.0f} ns")
@@ -0,0 +1,54 @@
+#!/bin/python3
+"""
+How long detect() takes to return after a key press, and how close to the timeout it
+returns when no key comes.
+
+Synthetic key presses are queued with event_generate a random time after detect()
+starts waiting, and the time from the press to detect() returning is reported. The
+keys go through a Tk window, so a server without a screen needs xvfb-run:
+
+    PYTHONPATH=. xvfb-run python benchmarks/detect_latency.py [presses]
+"""
+import sys
+from random import randint, seed
+from statistics import mean
+from time import perf_counter
+from turtle_oxford import *
+
+presses = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+seed(1)
+canvas = TurtleCanvas()
+canvas.create(0, 0, 200, 200, backend="tk")
+canvas._root.update()
+pressed_at = []
+
+
+def press():
+    pressed_at.append(perf_counter())
+    canvas._canvas.event_generate("<KeyPress>", keysym="a", when="tail")
+    canvas._canvas.event_generate("<KeyRelease>", keysym="a", when="tail")
+
+
+latencies = []
+for _ in range(presses):
+    canvas._root.after(randint(5, 50), press)
+    key = detect("a", 2000)
+    returned_at = perf_counter()
+    if key != "a":
+        print(f"detect returned {key!r} instead of 'a'")
+        sys.exit(1)
+    latencies.append((returned_at - pressed_at[-1]) * 1000)
+
+overshoots = []
+for timeout in (10, 50, 200):
+    start = perf_counter()
+    detect("b", timeout)
+    overshoots.append((perf_counter() - start) * 1000 - timeout)
+
+canvas._root.destroy()
+print(
+    f"key press to detect(): mean {mean(latencies):.2f} ms, max {max(latencies):.2f} ms "
+    f"over {presses} presses"
+)
+print("time past the timeout: " + ", ".join(f"{o:.2f} ms" for o in overshoots))
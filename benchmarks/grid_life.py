@@ -0,0 +1,40 @@
+#!/bin/python3
+"""
+Generations per second of a large Game of Life on a Grid.
+
+Steps a random board of Life and draws every generation on a raster canvas, then
+steps it again without drawing, and reports generations per second for both. The
+canvas uses the pillow backend:
+
+    PYTHONPATH=. python benchmarks/grid_life.py [size] [generations]
+"""
+import sys
+from random import seed
+from time import perf_counter
+from turtle_oxford import *
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+generations = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+seed(1)
+canvas = TurtleCanvas()
+canvas.create(0, 0, size, size, raster=True, backend="pillow")
+grid = Grid(size, size)
+grid.randomise(0.3)
+noupdate()
+grid.draw()
+
+start = perf_counter()
+for _ in range(generations):
+    grid.step()
+    grid.draw()
+    update()
+drawn = generations / (perf_counter() - start)
+
+start = perf_counter()
+grid.step(generations)
+stepped = generations / (perf_counter() - start)
+
+print(f"{size}x{size} Life, {grid.population()} cells alive after {grid.generation} generations")
+print(f"step and draw: {drawn:8.1f} generations/second")
+print(f"step only:     {stepped:8.1f} generations/second")
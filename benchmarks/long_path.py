@@ -0,0 +1,40 @@
+#!/bin/python3
+"""
+Checks that every forward() of a long path takes about the same time.
+
+Draws a path of many short moves, which is kept as few line items, and reports the time
+per move as it goes. Adding points to a Tk line item copies all its points, so before
+lines were cut at _LINE_POINTS points each move took longer than the last. It counts
+the items of a Tk canvas, so on a server run it in a virtual display:
+
+    PYTHONPATH=. xvfb-run python benchmarks/long_path.py [moves]
+"""
+import sys
+from time import perf_counter
+from turtle_oxford import *
+
+moves = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+report_every = max(moves // 10, 1)
+
+canvas = TurtleCanvas()
+canvas.create(0, 0, 500, 500, backend="tk")
+noupdate()
+times = []
+start = perf_counter()
+for move in range(1, moves + 1):
+    forward(2)
+    right(7)
+    if move % report_every == 0:
+        canvas.refresh()
+        times.append((perf_counter() - start) / report_every)
+        print(
+            f"moves {move - report_every + 1:>7}-{move:<7} "
+            f"{times[-1] * 1e6:8.2f} us/move "
+            f"{len(canvas._canvas.find_all()):>6} canvas items"
+        )
+        start = perf_counter()
+
+canvas._root.destroy()
+if len(times) > 1 and times[-1] > times[0] * 1.5:
+    print("Time per move grows with the length of the path")
+    sys.exit(1)
@@ -0,0 +1,71 @@
+#!/bin/python3
+"""
+Checks that setting the same pixels over and over takes constant time.
+
+Redraws a 32x32 Game of Life board every generation, like examples/game_of_life.py,
+and reports the time per generation and the number of canvas items as it goes. Before
+pixel items were reused, every generation added up to 1024 items and each one was
+slower than the last. Only Tk canvases have items, so it opens a window:
+
+    PYTHONPATH=. xvfb-run python benchmarks/pixel_items.py [generations]
+"""
+import sys
+from random import randint, seed
+from time import perf_counter
+from turtle_oxford import *
+
+width = 32
+height = 32
+generations = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+report_every = max(generations // 10, 1)
+
+
+def soup() -> list[list[bool]]:
+    return [[randint(0, 3) == 0 for x in range(width)] for y in range(height)]
+
+
+def step(board: list[list[bool]]) -> list[list[bool]]:
+    new_board = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            neighbours = sum(
+                board[(y + j) % height][(x + i) % width]
+                for i in (-1, 0, 1)
+                for j in (-1, 0, 1)
+                if i or j
+            )
+            row.append(neighbours == 3 or (board[y][x] and neighbours == 2))
+        new_board.append(row)
+    return new_board
+
+
+seed(1)
+canvas = TurtleCanvas()
+canvas.create(0, 0, 900, 900, backend="tk")
+resolution(width, height)
+board = soup()
+times = []
+start = perf_counter()
+for generation in range(1, generations + 1):
+    noupdate()
+    for y in range(height):
+        for x in range(width):
+            pixset(x, y, black if board[y][x] else white)
+    update()
+    new_board = step(board)
+    # keep the board busy, a settled board would not show anything
+    board = soup() if new_board == board else new_board
+    if generation % report_every == 0:
+        times.append((perf_counter() - start) / report_every)
+        print(
+            f"generations {generation - report_every + 1:>6}-{generation:<6} "
+            f"{times[-1] * 1000:8.2f} ms/generation "
+            f"{len(canvas._canvas.find_all()):>8} canvas items"
+        )
+        start = perf_counter()
+
+canvas._root.destroy()
+if len(times) > 1 and times[-1] > times[0] * 1.5:
+    print("Time per generation grows with the number of generations")
+    sys.exit(1)
@@ -0,0 +1,198 @@
+#!/bin/python3
+"""
+The speed and memory of every drawing primitive, to catch regressions.
+
+Runs forward, pixset, pixcol, blot, polygon, display and refresh one at a time on a new
+canvas for every combination of:
+
+- backend: every backend that can start here, "tk" needs a display
+- updating: the default of refreshing while drawing, or noupdate()
+- items: the number of lines already on the canvas
+
+and reports operations per second and the memory Python allocates per operation, as
+traced by tracemalloc (Tk's own memory is not included). The results can be saved as a
+baseline and later runs compared with it, failing when any primitive got slower by more
+than the tolerance. Runs anywhere with the pillow backend, or under xvfb-run for tk:
+
+    PYTHONPATH=. python benchmarks/primitives.py [--backends tk pillow]
+        [--items 0 1000 10000] [--seconds 0.5] [--save baseline.json] [--compare baseline.json]
+        [--tolerance 0.25] [--only forward pixset ...]
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from time import perf_counter
+from turtle_oxford import *
+
+size = 500
+
+
+def prepare_polygon(i: int):
+    for _ in range(3):
+        forward(20)
+        right(120)
+
+
+def place(i: int):
+    setxy(i * 7 % size, i * 13 % size)
+
+
+def set_pixel(i: int):
+    pixset(i % size, i // size % size, i & 0xFFFFFF)
+
+
+# each primitive: (setup before every call, not measured, or None; the call measured)
+primitives = {
+    "forward": (None, lambda i: forward(1 + i % 7)),
+    "pixset": (None, set_pixel),
+    "pixcol": (None, lambda i: pixcol(i * 7 % size, i * 13 % size)),
+    "blot": (place, lambda i: blot(5)),
+    "polygon": (prepare_polygon, lambda i: polygon(3)),
+    "display": (place, lambda i: display("Turtle")),
+    "refresh": (set_pixel, lambda i: current_canvas().refresh()),
+}
+
+
+def available_backends() -> list[str]:
+    """The backends that can start here.
+    """
+    names = ["pillow"]
+    try:
+        from tkinter import TclError
+    except ImportError:
+        # Python was built without Tk
+        return names
+    try:
+        canvas = TurtleCanvas()
+        canvas.create(0, 0, 10, 10, backend="tk")
+        canvas._root.destroy()
+        names.insert(0, "tk")
+    except TclError:
+        pass
+    return names
+
+
+def new_canvas(backend: str, items: int, updating: bool) -> TurtleCanvas:
+    """A canvas with `items` lines already drawn on it.
+    """
+    canvas = TurtleCanvas()
+    canvas.create(0, 0, size, size, backend=backend)
+    noupdate()
+    for i in range(items):
+        setxy(i * 7 % size, i * 13 % size)
+        forward(3)
+    home()
+    canvas.refresh()
+    if updating:
+        update()
+    return canvas
+
+
+def close(canvas: TurtleCanvas):
+    if canvas._root is not None:
+        canvas._root.destroy()
+
+
+def run(setup, call, calls: int) -> float:
+    """Time `calls` calls, leaving out the setup before each one.
+    """
+    elapsed = 0.0
+    for i in range(calls):
+        if setup:
+            setup(i)
+        start = perf_counter()
+        call(i)
+        elapsed += perf_counter() - start
+    return elapsed
+
+
+def measure(backend: str, name: str, updating: bool, items: int, seconds: float) -> dict:
+    """Operations per second and bytes allocated per operation of one primitive.
+    """
+    setup, call = primitives[name]
+    canvas = new_canvas(backend, items, updating)
+    # find how many calls take about the time given, then time that many
+    calls, elapsed = 1, run(setup, call, 1)
+    while elapsed < seconds / 10 and calls < 1_000_000:
+        calls *= 10
+        elapsed = run(setup, call, calls)
+    calls = max(int(calls * seconds / max(elapsed, 1e-9)), 1)
+    elapsed = run(setup, call, calls)
+    close(canvas)
+
+    # memory on a fresh canvas, tracing slows everything down so it is not timed
+    canvas = new_canvas(backend, items, updating)
+    memory_calls = min(calls, 2000)
+    allocated = 0
+    gc.collect()
+    tracemalloc.start()
+    for i in range(memory_calls):
+        if setup:
+            setup(i)
+        before = tracemalloc.get_traced_memory()[0]
+        call(i)
+        allocated += tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    close(canvas)
+    return {
+        "ops_per_sec": calls / elapsed if elapsed else float("inf"),
+        "bytes_per_op": allocated / memory_calls,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=None)
+    parser.add_argument("--items", nargs="+", type=int, default=[0, 1000, 10000])
+    parser.add_argument("--seconds", type=float, default=0.5)
+    parser.add_argument(
+        "--only", nargs="+", choices=list(primitives), default=list(primitives)
+    )
+    parser.add_argument("--save", metavar="JSON")
+    parser.add_argument("--compare", metavar="JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    backends = args.backends or available_backends()
+    results = {}
+    print(f"{'case':40}{'ops/sec':>14}{'bytes/op':>12}")
+    for backend in backends:
+        for name in args.only:
+            for updating in (True, False):
+                for items in args.items:
+                    mode = "update" if updating else "noupdate"
+                    case = f"{backend}/{name}/{mode}/{items}"
+                    result = measure(backend, name, updating, items, args.seconds)
+                    results[case] = result
+                    ops, memory = result["ops_per_sec"], result["bytes_per_op"]
+                    print(f"{case:40}{ops:14.0f}{memory:12.0f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = []
+        for case, result in results.items():
+            if case not in baseline:
+                continue
+            ratio = result["ops_per_sec"] / baseline[case]["ops_per_sec"]
+            if ratio < 1 - args.tolerance:
+                regressions.append(case)
+            slower = "  SLOWER" if case in regressions else ""
+            print(f"{case:40}{ratio:13.2f}x baseline{slower}")
+        if regressions:
+            print(
+                f"{len(regressions)} cases slower than the baseline by more than "
+                f"{args.tolerance:.0%}"
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+#!/bin/python3
+"""
+The bytes of pixels a raster canvas sends to Tk per frame.
+
+Moves a small sprite across a raster canvas one frame at a time, like a game loop, and
+reports the bytes uploaded per frame and the time per frame, compared with the whole
+canvas that was sent on every refresh before only the changed tiles were. Uploads
+only happen to a Tk PhotoImage, hence xvfb-run where there is no screen:
+
+    PYTHONPATH=. xvfb-run python benchmarks/raster_upload.py [frames]
+"""
+import sys
+from time import perf_counter
+from turtle_oxford import *
+
+frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+size = 800
+
+canvas = TurtleCanvas()
+canvas.create(0, 0, size, size, raster=True, backend="tk")
+noupdate()
+update()
+record_stats()
+uploads = []
+start = perf_counter()
+for frame in range(frames):
+    x = frame * 3 % (size - 16)
+    setxy(x - 3, 100)
+    box(16, 16, white, False)
+    setxy(x, 100)
+    box(16, 16, red, False)
+    update()
+    uploads.append(stats()["last_upload"])
+elapsed = perf_counter() - start
+canvas._root.destroy()
+
+full = size * size * 3
+print(f"{sum(uploads) / frames:12.0f} bytes/frame uploaded")
+print(f"{full:12.0f} bytes/frame for the whole canvas")
+print(f"{elapsed / frames * 1000:12.2f} ms/frame")
@@ -0,0 +1,68 @@
+#!/bin/python3
+"""
+Lines, blots and polygons per second drawn into the framebuffer of the Tk backend.
+
+Drawings on a raster Tk canvas only go into a framebuffer, which vector canvases also
+keep to answer pixcol(). This times drawing short lines one at a time, all apart in one
+go like a Swarm draws them and as one long line, blots and polygons into a framebuffer,
+without Tk, so no window opens:
+
+    PYTHONPATH=. python benchmarks/rasterizers.py [lines]
+"""
+import sys
+from array import array
+from random import random, seed
+from time import perf_counter
+from turtle_oxford import _Framebuffer
+
+lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+size = 1000
+
+seed(1)
+pixels = _Framebuffer(size, size)
+coords = [size / 2, size / 2]
+for _ in range(lines):
+    coords.append((coords[-2] + random() * 6 - 3) % size)
+    coords.append((coords[-2] + random() * 6 - 3) % size)
+coords = tuple(coords)
+# the same short lines apart, each from a point of the long line to the next
+apart = array("f", bytes(16 * lines))
+apart[0::4] = array("f", coords[0:-2:2])
+apart[1::4] = array("f", coords[1:-2:2])
+apart[2::4] = array("f", coords[2::2])
+apart[3::4] = array("f", coords[3::2])
+colours = array("I", [0]) * lines
+
+
+def rate(name: str, count: int, draw: callable):
+    start = perf_counter()
+    draw()
+    elapsed = perf_counter() - start
+    print(f"{name:32}{count / elapsed:14.0f} /second")
+
+
+few = min(lines, 20000)
+rate(
+    "short lines, one at a time",
+    few,
+    lambda: [pixels.lines(coords[i : i + 4], 0, 1) for i in range(0, 2 * few, 2)],
+)
+rate("short lines, apart in one go", lines, lambda: pixels.segments(apart, colours, 1))
+rate("short lines, as one line", lines, lambda: pixels.lines(coords, 0, 1))
+rate("thick lines, as one line", lines, lambda: pixels.lines(coords, 0, 3))
+rate(
+    "blots of radius 5",
+    few,
+    lambda: [
+        pixels.ellipse(x, y, x + 10, y + 10, 0)
+        for x, y in zip(coords[: 2 * few : 2], coords[1 : 2 * few : 2])
+    ],
+)
+rate(
+    "triangles",
+    few,
+    lambda: [
+        pixels.polygon([(x, y), (x + 20, y), (x, y + 20)], 0)
+        for x, y in zip(coords[: 2 * few : 2], coords[1 : 2 * few : 2])
+    ],
+)
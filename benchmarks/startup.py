@@ -0,0 +1,58 @@
+#!/bin/python3
+"""
+How long a fresh interpreter takes to import turtle_oxford.
+
+Starts a new Python many times for each case and reports the fastest and the median
+time, with bare interpreter startup for comparison, then the imports that took longest
+in one run of `python -X importtime`. Tk, Pillow and asyncio are only imported when
+first used, so importing the module for its helpers should cost little more than
+starting Python. It sets PYTHONPATH for the interpreters it starts itself:
+
+    python benchmarks/startup.py [runs]
+"""
+import os
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+
+runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+env = dict(os.environ, PYTHONPATH=root)
+
+cases = [
+    ("python", "pass"),
+    ("import turtle_oxford", "import turtle_oxford"),
+    (
+        "helpers only",
+        "from turtle_oxford import *; qstr(22, 7, 3); mixcols(red, blue, 1, 1)",
+    ),
+    (
+        "off screen canvas",
+        "from turtle_oxford import *; TurtleCanvas().create(backend='pillow'); forward(10)",
+    ),
+]
+
+print(f"{'':24}{'fastest':>12}{'median':>12}")
+for name, code in cases:
+    times = []
+    for _ in range(runs):
+        start = perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+        times.append((perf_counter() - start) * 1000)
+    print(f"{name:24}{min(times):9.1f} ms{median(times):9.1f} ms")
+
+result = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", "import turtle_oxford"],
+    env=env,
+    capture_output=True,
+    text=True,
+    check=True,
+)
+imports = []
+for line in result.stderr.splitlines()[1:]:
+    _, cumulative, module = line.split("|")
+    imports.append((int(cumulative), module.rstrip()))
+print("\nslowest imports, cumulative:")
+for cumulative, module in sorted(imports, reverse=True)[:8]:
+    print(f"{cumulative / 1000:9.1f} ms {module}")
@@ -0,0 +1,14 @@
+#!/bin/python3
+from turtle_oxford import *
+
+width = 300
+height = 300
+with turtle_canvas(0, 0, 900, 900, raster=True) as t:
+    resolution(width, height)
+    grid = Grid(width, height, rule="B3/S23")
+    grid.randomise(0.3)
+    while get_key_sym() != "Escape":
+        noupdate()
+        grid.draw()
+        update()
+        grid.step()
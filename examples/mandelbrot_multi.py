@@ -1,4 +1,5 @@
 from turtle_oxford import *
+from functools import partial
 from time import time
 
 # STARTPROMPT offers the user either to display the entire Mandelbrot set or to
@@ -52,50 +53,53 @@ maxcol = (
     40  # each iteration is represented by a different colour, so 40 colours altogether
 )
 colmult = 0xFFFFFF // 40
-startprompt()
-xstart = (
-    int(xcentre / 1000000 * scale) - pixels // 2
-)  # DIVMULT provides optimal integer arithmetic,
-ystart = (
-    int(ycentre / 1000000 * scale) - pixels // 2
-)  # avoiding intermediate rounding errors
-xfinish = xstart + pixels
-yfinish = ystart + pixels
-print("Mandelbrot will be plotted over the following real range:")
-print(str(xstart / scale) + " < x < " + str(xfinish / scale), end="    ")
-print(str(ystart / scale) + " < y < " + str(yfinish / scale))
-print(
-    "Scaling factor: "
-    + str(scale)
-    + "    Image resolution: "
-    + str(pixels)
-    + "x"
-    + str(pixels)
-)
 
-with turtle_canvas(xstart, ystart, pixels, pixels) as t:
-    resolution(pixels, pixels)  # Resolution depends on the speed chosen
-    t = time()
-    for a in range(xstart, xfinish):
-        noupdate()
-        for b in range(ystart, yfinish):  # Count through points (a,b) in the region ...
-            x = a  # Generate series of points (x,y) starting from (a,b)
-            y = b
-            iterations = 0  # Count iterations up to MAXCOL
-            while (math.hypot(x, y) < 2 * scale) and (
-                iterations <= maxcol
-            ):  # Series diverges if distance of
-                temp = (x + y) / scale * (x - y)  # (x,y) from origin reaches 2
-                y = (2 * x) / scale * y + b
-                x = temp + a  # Otherwise, calculate next point (x,y) in series
-                iterations += 1
-            if (
-                iterations > maxcol
-            ):  # If series hasn't diverged after MAXCOL, point, then
-                pixset(a, b, "black")  # (a,b) - the starting point - is coloured black
-            else:
-                pixset(
-                    a, b, iterations * colmult
-                )  # Otherwise, it's colour shows how quickly it diverged
+
+# MANDELBROT gives the colour of the point (a,b) at the given scale. It runs in the
+# worker processes of render_tiles, so it only uses its arguments and constants
+def mandelbrot(a, b, scale):
+    x = a  # Generate series of points (x,y) starting from (a,b)
+    y = b
+    iterations = 0  # Count iterations up to MAXCOL
+    while (math.hypot(x, y) < 2 * scale) and (
+        iterations <= maxcol
+    ):  # Series diverges if distance of
+        temp = (x + y) / scale * (x - y)  # (x,y) from origin reaches 2
+        y = (2 * x) / scale * y + b
+        x = temp + a  # Otherwise, calculate next point (x,y) in series
+        iterations += 1
+    if iterations > maxcol:  # If series hasn't diverged after MAXCOL, point, then
+        return black  # (a,b) - the starting point - is coloured black
+    return iterations * colmult  # Otherwise, it's colour shows how quickly it diverged
+
+
+# The worker processes import this file again, only the main process asks and draws
+if __name__ == "__main__":
+    startprompt()
+    xstart = (
+        int(xcentre / 1000000 * scale) - pixels // 2
+    )  # DIVMULT provides optimal integer arithmetic,
+    ystart = (
+        int(ycentre / 1000000 * scale) - pixels // 2
+    )  # avoiding intermediate rounding errors
+    xfinish = xstart + pixels
+    yfinish = ystart + pixels
+    print("Mandelbrot will be plotted over the following real range:")
+    print(str(xstart / scale) + " < x < " + str(xfinish / scale), end="    ")
+    print(str(ystart / scale) + " < y < " + str(yfinish / scale))
+    print(
+        "Scaling factor: "
+        + str(scale)
+        + "    Image resolution: "
+        + str(pixels)
+        + "x"
+        + str(pixels)
+    )
+
+    with turtle_canvas(xstart, ystart, pixels, pixels, raster=True) as t:
+        resolution(pixels, pixels)  # Resolution depends on the speed chosen
+        t = time()
+        # Every core computes tiles of the picture, which are drawn as they are finished
+        render_tiles(partial(mandelbrot, scale=scale), xstart, ystart, pixels, pixels)
         update()
-    print("Time taken: " + str(time() - t) + " seconds.")
+        print("Time taken: " + str(time() - t) + " seconds.")
@@ -0,0 +1,52 @@
+"""
+Regression tests of the display list, on the off screen backend.
+"""
+from turtle_oxford import *
+from turtle_oxford import _LINE, _PIXEL
+
+
+def new_canvas() -> TurtleCanvas:
+    canvas = TurtleCanvas()
+    canvas.create(0, 0, 200, 200, backend="pillow")
+    noupdate()
+    return canvas
+
+
+def test_path_is_one_line():
+    canvas = new_canvas()
+    setxy(70, 100)
+    for _ in range(4):
+        forward(20)
+        right(90)
+    assert [op for op, *_ in canvas._display_list] == [_LINE]
+
+
+def test_line_after_compaction_is_not_added_to_a_pixel():
+    canvas = new_canvas()
+    for x in range(10):
+        pixset(x, 0, red)
+    setxy(70, 100)
+    forward(50)
+    # enough pixels covered again to compact the display list, renumbering it
+    for i in range(1025):
+        pixset(i % 10, 0, blue if i & 1 else green)
+    movexy(0, 50)
+    for op, coords, *_ in canvas._display_list:
+        if op == _PIXEL:
+            assert len(coords) == 2
+    image = canvas._backend.image.tobytes()
+    resolution(200, 200)
+    assert canvas._backend.image.tobytes() == image
+
+
+def test_long_path_is_split_into_lines_of_bounded_length():
+    canvas = new_canvas()
+    for _ in range(10000):
+        forward(1)
+        right(1)
+    lines = [coords for op, coords, *_ in canvas._display_list]
+    assert len(lines) == 3
+    assert all(len(coords) <= 2 * 4096 for coords in lines)
+    # every line starts where the one before it ended
+    for before, after in zip(lines, lines[1:]):
+        assert before[-2:] == after[:2]
@@ -0,0 +1,96 @@
+"""
+Tests of the scanline flood fill, on the off screen backend.
+"""
+from collections import deque
+from random import Random
+
+from turtle_oxford import *
+
+size = 24
+
+
+def new_canvas() -> TurtleCanvas:
+    canvas = TurtleCanvas()
+    canvas.create(0, 0, size, size, backend="pillow")
+    noupdate()
+    return canvas
+
+
+def pixels() -> list[list[int]]:
+    return pixcol_region(0, 0, size, size)
+
+
+def naive_fill(before: list[list[int]], x: int, y: int, fillable, colour: int):
+    """Fill pixel by pixel, across and down only."""
+    after = [row[:] for row in before]
+    seen = {(x, y)}
+    queue = deque(seen)
+    while queue:
+        x, y = queue.popleft()
+        after[y][x] = colour
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (
+                0 <= nx < size
+                and 0 <= ny < size
+                and (nx, ny) not in seen
+                and fillable(before[ny][nx])
+            ):
+                seen.add((nx, ny))
+                queue.append((nx, ny))
+    return after
+
+
+def test_fill_stops_at_the_boundary():
+    new_canvas()
+    for i in range(size):
+        pixset(i, 10, black)
+        pixset(10, i, black)
+    colour(red)
+    fill(3, 3, black)
+    after = pixels()
+    for y in range(size):
+        for x in range(size):
+            expected = black if 10 in (x, y) else red if x < 10 and y < 10 else white
+            assert after[y][x] == expected
+
+
+def test_fill_does_not_leak_through_a_diagonal_wall():
+    new_canvas()
+    for i in range(size):
+        pixset(i, i, black)
+    colour(red)
+    fill(size - 1, 0, black)
+    after = pixels()
+    for y in range(size):
+        for x in range(size):
+            expected = red if x > y else black if x == y else white
+            assert after[y][x] == expected
+
+
+def test_fill_matches_a_naive_fill():
+    random = Random(5)
+    for boundary in (black, -1):
+        new_canvas()
+        for _ in range(150):
+            pixset(random.randrange(size), random.randrange(size), black)
+        for _ in range(60):
+            pixset(random.randrange(size), random.randrange(size), blue)
+        before = pixels()
+        x, y = 5, 5
+        pixset(x, y, white)
+        before[y][x] = white
+        colour(red)
+        fill(x, y, boundary)
+        if boundary < 0:
+            fillable = white.__eq__
+        else:
+            fillable = black.__ne__
+        assert pixels() == naive_fill(before, x, y, fillable, red)
+
+
+def test_fill_of_the_same_colour_draws_nothing():
+    canvas = new_canvas()
+    colour(white)
+    assert fill(3, 3, -1) == -1
+    assert fill(size, 3, -1) == -1
+    assert len(canvas._display_list) == 0
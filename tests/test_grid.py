@@ -0,0 +1,88 @@
+"""
+Tests of Grid, against a naive step of every cell, and of drawing it.
+"""
+from random import Random
+
+import pytest
+
+from turtle_oxford import *
+
+
+def naive_step(cells: list[list[int]], birth, survival, wrap: bool):
+    height, width = len(cells), len(cells[0])
+    new = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            neighbours = 0
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    if not (dx or dy):
+                        continue
+                    nx, ny = x + dx, y + dy
+                    if wrap:
+                        nx, ny = nx % width, ny % height
+                    elif not (0 <= nx < width and 0 <= ny < height):
+                        continue
+                    neighbours += cells[ny][nx]
+            alive = neighbours in (survival if cells[y][x] else birth)
+            row.append(int(alive))
+        new.append(row)
+    return new
+
+
+def rows(grid: Grid) -> list[list[int]]:
+    cells = grid.cells()
+    width = grid.width
+    return [list(cells[y * width : (y + 1) * width]) for y in range(grid.height)]
+
+
+@pytest.mark.parametrize("wrap", [True, False])
+@pytest.mark.parametrize(
+    "rule, birth, survival",
+    [
+        ("B3/S23", {3}, {2, 3}),
+        ("B36/S23", {3, 6}, {2, 3}),
+        ("B1/S012345678", {1}, set(range(9))),
+    ],
+)
+@pytest.mark.parametrize("width, height", [(13, 9), (1, 5), (40, 3)])
+def test_grid_matches_a_naive_step(wrap, rule, birth, survival, width, height):
+    random = Random(width * height)
+    grid = Grid(width, height, rule, wrap)
+    grid.set_cells(bytes(random.random() < 0.4 for _ in range(width * height)))
+    expected = rows(grid)
+    for _ in range(6):
+        expected = naive_step(expected, birth, survival, wrap)
+        grid.step()
+        assert rows(grid) == expected
+    assert grid.generation == 6
+    assert grid.population() == sum(map(sum, expected))
+
+
+def test_cells_by_index():
+    grid = Grid(5, 4)
+    grid[4, 3] = True
+    assert grid[4, 3] and not grid[3, 3]
+    assert grid.cells()[-1] == 1
+    with pytest.raises(IndexError):
+        grid[5, 0]
+    with pytest.raises(ValueError):
+        grid.set_cells(bytes(3))
+
+
+def test_draw_shows_the_cells_and_only_changes():
+    canvas = TurtleCanvas()
+    canvas.create(0, 0, 40, 40, raster=True, backend="pillow")
+    noupdate()
+    grid = Grid(20, 20, x=10, y=5, alive=red, dead=blue)
+    grid.randomise(0.5)
+    grid.draw()
+    cells = rows(grid)
+    shown = pixcol_region(10, 5, 20, 20)
+    assert shown == [[red if cell else blue for cell in row] for row in cells]
+    assert grid.draw() == -1
+    grid.step()
+    grid.draw()
+    shown = pixcol_region(10, 5, 20, 20)
+    assert shown == [[red if cell else blue for cell in row] for row in rows(grid)]
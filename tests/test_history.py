@@ -0,0 +1,63 @@
+"""
+Tests of the ring buffer keeping the positions of the turtle.
+"""
+from random import Random
+
+import pytest
+
+from turtle_oxford import _History
+
+
+def check(history: _History, positions: list[tuple[float, float]]):
+    assert len(history) == len(positions)
+    for n in (0, 1, 3, len(positions)):
+        xs, ys = history.last(n)
+        assert list(zip(xs, ys)) == positions[-n:]
+
+
+def test_history_matches_a_list():
+    random = Random(2)
+    history = _History(8)
+    positions = []
+    capacity = 8
+    for step in range(3000):
+        action = random.random()
+        if action < 0.6:
+            x, y = float(step), float(-step)
+            history.append(x, y)
+            positions = (positions + [(x, y)])[-capacity:]
+        elif action < 0.75:
+            count = random.randrange(0, 20)
+            xs = [float(step * 100 + i) for i in range(count)]
+            ys = [float(-i) for i in range(count)]
+            history.extend(xs, ys)
+            positions = (positions + list(zip(xs, ys)))[-capacity:]
+        elif action < 0.9:
+            n = random.randrange(0, len(positions) + 1)
+            history.forget(n)
+            del positions[len(positions) - n :]
+        else:
+            capacity = random.randrange(1, 16)
+            history.resize(capacity)
+            positions = positions[-capacity:]
+        check(history, positions)
+
+
+def test_history_wraps_around_when_full():
+    history = _History(4)
+    for i in range(10):
+        history.append(i, i)
+    assert len(history) == 4
+    assert list(history.last(4)[0]) == [6, 7, 8, 9]
+    assert list(history.coords(2, 1, 2)) == [7, 6, 8, 7]
+
+
+def test_history_refuses_what_it_cannot_do():
+    history = _History(4)
+    history.append(1, 1)
+    with pytest.raises(IndexError):
+        history.forget(2)
+    with pytest.raises(ValueError):
+        history.resize(0)
+    with pytest.raises(ValueError):
+        _History(0)
@@ -0,0 +1,27 @@
+"""
+Tests of raster Tk canvases at a resolution coarser than the window.
+
+Raster canvases only draw into their framebuffer until they are refreshed, so these make
+the backend without a window and never refresh it.
+"""
+from turtle_oxford import _TkBackend, black, white
+
+
+def raster_backend(size: int, resolution: int) -> _TkBackend:
+    backend = _TkBackend.__new__(_TkBackend)
+    backend.width = backend.height = size
+    backend.raster = True
+    backend.image_id = 1
+    backend.set_resolution(size / resolution, size / resolution)
+    return backend
+
+
+def test_rectangle_borders_thinner_than_a_pixel_are_drawn():
+    backend = raster_backend(900, 32)
+    assert (backend.pixels.width, backend.pixels.height) == (32, 32)
+    backend.rectangle(90, 90, 450, 450, white, 1)
+    # the edges are at 3.2 and 16 pixels of the resolution
+    for x, y in ((3, 10), (16, 10), (10, 3), (10, 16), (3, 3), (16, 16)):
+        assert backend.pixels.get(x, y) == black, (x, y)
+    assert backend.pixels.get(10, 10) == white
+    assert backend.pixels.get(2, 10) == backend.pixels.get(17, 10) == white
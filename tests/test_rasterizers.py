@@ -0,0 +1,40 @@
+"""
+Regression tests of the rasterizers drawing into the framebuffer of raster canvases.
+"""
+from array import array
+from random import Random
+from types import SimpleNamespace
+
+from PIL import Image, ImageDraw
+
+from turtle_oxford import _Framebuffer, _separate_lines
+
+
+def test_separate_lines_in_one_go_match_pillow():
+    random = Random(1)
+    coords = array("f", [random.uniform(-20, 120) for _ in range(4 * 500)])
+    colours = array(
+        "I", [random.choice((0xFF0000, 0x00FF00, 0x0000FF)) for _ in range(500)]
+    )
+    for width in (1, 3):
+        pixels = _Framebuffer(100, 100)
+        pixels.segments(coords, colours, width)
+        image = Image.new("RGB", (100, 100), "white")
+        draw = ImageDraw.Draw(image)
+        for i, colour in enumerate(colours):
+            line = list(coords[4 * i : 4 * i + 4])
+            draw.line(line, fill=tuple(colour.to_bytes(3, "big")), width=width)
+        assert bytes(pixels.data) == image.tobytes()
+
+
+def test_separate_lines_without_the_pillow_core_match_it():
+    random = Random(2)
+    coords = array("f", [random.uniform(-20, 120) for _ in range(4 * 200)])
+    colours = array("I", [random.choice((0xFF0000, 0x0000FF)) for _ in range(200)])
+    core = Image.new("RGBA", (100, 100))
+    _separate_lines(ImageDraw.Draw(core), coords, colours, 2)
+    public = Image.new("RGBA", (100, 100))
+    # only ImageDraw.line is left, as if a release of Pillow changed its core
+    draw = SimpleNamespace(draw=None, line=ImageDraw.Draw(public).line)
+    _separate_lines(draw, coords, colours, 2)
+    assert public.tobytes() == core.tobytes()
@@ -0,0 +1,44 @@
+"""
+Tests of render_tiles(), on the off screen backend.
+"""
+from array import array
+
+from turtle_oxford import *
+
+
+def shade(x: int, y: int) -> int:
+    return (x * 7 + y * 13) % 256 * 0x10101
+
+
+def shade_tile(x: int, y: int, w: int, h: int) -> array:
+    return array("I", [shade(i, j) for j in range(y, y + h) for i in range(x, x + w)])
+
+
+def new_canvas() -> TurtleCanvas:
+    canvas = TurtleCanvas()
+    canvas.create(0, 0, 100, 80, backend="pillow")
+    noupdate()
+    return canvas
+
+
+def serial() -> bytes:
+    canvas = new_canvas()
+    for j in range(5, 75):
+        for i in range(3, 93):
+            pixset(i, j, shade(i, j))
+    return canvas._backend.image.tobytes()
+
+
+def test_tiles_match_a_serial_render():
+    expected = serial()
+    for workers in (1, 2):
+        for per_tile, func in ((False, shade), (True, shade_tile)):
+            canvas = new_canvas()
+            render_tiles(func, 3, 5, 90, 70, workers, tile_size=32, per_tile=per_tile)
+            assert canvas._backend.image.tobytes() == expected
+
+
+def test_empty_block_draws_nothing():
+    canvas = new_canvas()
+    assert render_tiles(shade, 0, 0, 0, 10, 1) == -1
+    assert len(canvas._display_list) == 0
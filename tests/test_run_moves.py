@@ -0,0 +1,78 @@
+"""
+Tests of run_moves() and paths, on the off screen backend.
+"""
+from random import Random
+
+import pytest
+
+from turtle_oxford import *
+
+calls = {"fd": forward, "bk": back, "lt": left, "rt": right}
+
+
+def random_moves(seed: int, count: int) -> list[tuple[str, int]]:
+    random = Random(seed)
+    return [
+        (random.choice(list(calls)), random.randrange(1, 60)) for _ in range(count)
+    ]
+
+
+def draw(moves, units: int, pen: bool, in_one_go: bool):
+    """Return the image, position, direction and history after the moves."""
+    canvas = TurtleCanvas()
+    canvas.create(0, 0, 300, 300, backend="pillow")
+    noupdate()
+    angles(units)
+    colour(red)
+    if not pen:
+        penup()
+    if in_one_go:
+        run_moves(moves)
+    else:
+        for move, amount in moves:
+            calls[move](amount)
+    return (
+        canvas._backend.image.tobytes(),
+        (canvas._x, canvas._y, canvas._direction),
+        list(zip(*canvas._history.last(canvas._history.length))),
+    )
+
+
+def assert_same(one, other):
+    image, state, history = one
+    assert image == other[0]
+    assert state == pytest.approx(other[1])
+    assert len(history) == len(other[2])
+    for position, expected in zip(history, other[2]):
+        assert position == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("units", [360, 7])
+@pytest.mark.parametrize("pen", [True, False])
+def test_run_moves_matches_the_calls(units: int, pen: bool):
+    moves = random_moves(units, 200)
+    assert_same(draw(moves, units, pen, True), draw(moves, units, pen, False))
+
+
+def test_path_matches_run_moves():
+    canvas = TurtleCanvas()
+    canvas.create(0, 0, 300, 300, backend="pillow")
+    noupdate()
+    colour(red)
+    path().fd(50).rt(90).fd(50).lt(45).bk(20).draw()
+    moves = [("fd", 50), ("rt", 90), ("fd", 50), ("lt", 45), ("bk", 20)]
+    assert_same(
+        (
+            canvas._backend.image.tobytes(),
+            (canvas._x, canvas._y, canvas._direction),
+            list(zip(*canvas._history.last(canvas._history.length))),
+        ),
+        draw(moves, 360, True, False),
+    )
+
+
+def test_run_moves_refuses_unknown_moves():
+    canvas = TurtleCanvas()
+    canvas.create(0, 0, 100, 100, backend="pillow")
+    with pytest.raises(ValueError):
+        run_moves([("fd", 10), ("jump", 10)])
@@ -0,0 +1,50 @@
+"""
+Regression tests of canvases used from several threads at once.
+"""
+import os
+import subprocess
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pillow is first imported by the threads creating their canvases at the same moment
+script = """
+import threading
+from turtle_oxford import *
+
+errors = []
+barrier = threading.Barrier(16)
+
+
+def work():
+    try:
+        barrier.wait()
+        canvas = TurtleCanvas()
+        canvas.create(0, 0, 50, 50, backend="pillow")
+        forward(10)
+        display("Turtle")
+        pixset(1, 1, "red")
+    except Exception as error:
+        errors.append(repr(error))
+
+
+threads = [threading.Thread(target=work) for _ in range(16)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+print(len(errors), errors[:1])
+"""
+
+
+def test_first_canvases_made_in_threads_at_once():
+    for _ in range(3):
+        # a new interpreter every time, so nothing is imported yet
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            env=dict(os.environ, PYTHONPATH=root),
+            check=True,
+        )
+        assert result.stdout.startswith("0 "), result.stdout
@@ -0,0 +1,25 @@
+"""
+Tests of Turtle objects, on the off screen backend.
+"""
+from turtle_oxford import *
+
+
+def test_a_turtle_keeps_its_own_history():
+    canvas = TurtleCanvas()
+    canvas.create(0, 0, 200, 200, backend="pillow")
+    noupdate()
+    setxy(10, 10)
+    forward(20)
+    history = list(zip(*canvas._history.last(canvas._history.length)))
+    turtle = Turtle(100, 100)
+    for _ in range(3):
+        turtle.forward(30)
+        turtle.right(120)
+    assert list(zip(*canvas._history.last(canvas._history.length))) == history
+    assert len(turtle.history) == 3
+    assert (canvas._x, canvas._y) == (10, -10)
+    # the polygon of the turtle is the triangle it went round
+    turtle.set_colour(red)
+    turtle.polygon(3)
+    assert pixcol(108, 85) == red
+    assert pixcol(10, 0) != red
@@ -0,0 +1,50 @@
+"""
+Tests of off screen canvases on a Python without Tk.
+"""
+import os
+import subprocess
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# importing tkinter fails once its entry in sys.modules is None
+script = """
+import asyncio
+import sys
+
+sys.modules["tkinter"] = None
+from turtle_oxford import *
+
+try:
+    with turtle_canvas(backend="pillow"):
+        forward(10)
+        raise ValueError("from the program")
+except ValueError as error:
+    print("turtle_canvas", error)
+
+
+async def main():
+    async with aturtle_canvas(backend="pillow"):
+        forward(10)
+        raise ValueError("from the program")
+
+
+try:
+    asyncio.run(main())
+except ValueError as error:
+    print("aturtle_canvas", error)
+"""
+
+
+def test_errors_of_the_program_go_through_unchanged():
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=root),
+        check=True,
+    )
+    assert result.stdout.splitlines() == [
+        "turtle_canvas from the program",
+        "aturtle_canvas from the program",
+    ], result.stdout + result.stderr
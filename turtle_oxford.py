@@ -2,50 +2,1746 @@
 Turtle Oxford - a python library for the Oxford Turtle System
 """
 
-from contextlib import contextmanager
-import logging
+from __future__ import annotations
+
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, partial, wraps
+import importlib
+from collections import deque
+from itertools import accumulate, repeat
+import io
 import math
-from PIL import ImageColor
-from time import sleep
-from tkinter import *
+import os
+from time import perf_counter, sleep
 from constants import *
 import random
 import string
 import sys
+from array import array
+from operator import itemgetter
+
+
+class _LazyModule:
+    """Private. Stands for a module, imported when one of its attributes is first used.
+
+    Tk, Pillow and asyncio take longer to import than everything else together, and
+    programs using only the helpers that need no canvas never use them. The module is
+    imported with a plain import, which is safe when several threads use it at once.
+    """
+
+    def __init__(self, name: str):
+        """
+        :param name: the full name of the module
+        :type name: str
+        """
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        module = self._module
+        if module is None:
+            module = importlib.import_module(self._name)
+            self._module = module
+        return getattr(module, attr)
+
+
+asyncio = _LazyModule("asyncio")
+logging = _LazyModule("logging")
+tkinter = _LazyModule("tkinter")
+Image = _LazyModule("PIL.Image")
+ImageColor = _LazyModule("PIL.ImageColor")
+ImageDraw = _LazyModule("PIL.ImageDraw")
+ImageFont = _LazyModule("PIL.ImageFont")
+
+
+def _window_closed() -> tuple[type[Exception], ...]:
+    """Private. The exceptions meaning that a window was closed, for an except clause.
+
+    Only Tk windows can be closed, and Tk raises TclError once they are. Reading
+    tkinter.TclError while another exception is handled would import tkinter, which fails
+    where Python has no Tk and hides that exception, so it is only read once Tk was used.
+    """
+    tk = sys.modules.get("tkinter")
+    return (tk.TclError,) if tk is not None else ()
+
+
+def _rgb_to_ints(rgb: bytes) -> array:
+    """Private. Convert packed RGB bytes to an array of rgb integers without a per-pixel loop.
+    """
+    # widen every pixel to 4 big-endian bytes, then read them as native unsigned ints
+    wide = bytearray(len(rgb) // 3 * 4)
+    for channel in range(3):
+        wide[channel + 1 :: 4] = rgb[channel::3]
+    ints = array("I", wide)
+    if sys.byteorder == "little":
+        ints.byteswap()
+    return ints
+
+
+def _ints_to_rgb(raw: bytes, itemsize: int) -> bytearray:
+    """Private. Convert the raw bytes of native rgb integers of any size to packed RGB bytes.
+    """
+    rgb = bytearray(len(raw) // itemsize * 3)
+    if sys.byteorder == "little":
+        offsets = (2, 1, 0)
+    else:
+        offsets = (itemsize - 3, itemsize - 2, itemsize - 1)
+    for channel, offset in enumerate(offsets):
+        rgb[channel::3] = raw[offset::itemsize]
+    return rgb
+
+
+def _to_rgb(colours, width: int | None = None) -> tuple[bytes, int, int]:
+    """Private. Convert a block of colours to packed RGB bytes and its width and height.
+
+    Objects supporting the buffer protocol (bytes, ``array('I')``, NumPy arrays) are
+    converted without a per-pixel loop. A buffer with one byte per item is taken to be
+    packed RGB already; wider items are rgb integers. The shape comes from the buffer
+    when it has 2 or 3 dimensions, otherwise from ``width``.
+    """
+    try:
+        view = memoryview(colours)
+    except TypeError:
+        # a plain sequence of colours
+        try:
+            view = memoryview(array("I", colours))
+        except TypeError:
+            view = memoryview(array("I", map(colour_to_int, colours)))
+    shape = view.shape
+    raw = view.cast("B") if view.c_contiguous else memoryview(view.tobytes())
+    if view.itemsize == 1:
+        rgb = raw
+        if len(shape) == 3:
+            shape = shape[:2]
+        pixels = len(rgb) // 3
+    else:
+        rgb = _ints_to_rgb(raw, view.itemsize)
+        pixels = len(rgb) // 3
+    if len(shape) >= 2:
+        height, width = shape[0], shape[1]
+    elif width is None:
+        width, height = pixels, 1
+    else:
+        height = pixels // width if width else 0
+    if width * height * 3 != len(rgb):
+        raise ValueError(
+            f"{pixels} colours do not make a block {width} pixels wide"
+        )
+    return rgb, width, height
+
+
+class _Framebuffer:
+    """Private. A contiguous RGB pixel buffer, 3 bytes per pixel in row-major order.
+
+    Besides holding the pixels of raster canvases, it shadows every drawing made on a
+    vector canvas, so that the colour of any pixel can be read back in constant time.
+    Shapes are rasterized by sampling pixel centres, the same rule Tk uses.
+
+    The tiles of the buffer that were drawn on are remembered, so that only those need to
+    be shown again, see take_dirty().
+    """
+
+    # width and height of the tiles changes are tracked in
+    tile = 64
+
+    def __init__(
+        self, width: int, height: int, colour: int = white, data: bytes | None = None
+    ):
+        """
+        :param width: width of the buffer in pixels
+        :type width: int
+        :param height: height of the buffer in pixels
+        :type height: int
+        :param colour: initial colour of every pixel (Default: white)
+        :type colour: int
+        :param data: initial packed RGB pixels, instead of a single colour
+        :type data: bytes, optional
+        """
+        self.width = width
+        self.height = height
+        if data is None:
+            self.data = bytearray(colour.to_bytes(3, "big") * (width * height))
+        else:
+            self.data = bytearray(data)
+        # (column, row) of every tile drawn on since take_dirty()
+        self.dirty: set[tuple[int, int]] = set()
+        self._touch(0, 0, width, height)
+
+    def _touch(self, x1: float, y1: float, x2: float, y2: float):
+        """Note that pixels in [x1, x2) x [y1, y2) may have changed.
+        """
+        x1, y1 = max(math.floor(x1), 0), max(math.floor(y1), 0)
+        x2, y2 = min(math.ceil(x2), self.width), min(math.ceil(y2), self.height)
+        if x1 >= x2 or y1 >= y2:
+            return
+        tile = self.tile
+        left, right = x1 // tile, (x2 - 1) // tile + 1
+        top, bottom = y1 // tile, (y2 - 1) // tile + 1
+        if right - left == 1 and bottom - top == 1:
+            self.dirty.add((left, top))
+        else:
+            self.dirty.update(
+                (column, row) for row in range(top, bottom) for column in range(left, right)
+            )
+
+    def take_dirty(self) -> list[tuple[int, int, int, int]]:
+        """Return the parts of the buffer drawn on since the last call, as few rectangles.
+
+        Runs of tiles next to each other in a row become one rectangle, and rectangles
+        spanning the same columns in consecutive rows are joined.
+
+        :return: (x1, y1, x2, y2) of each rectangle, clipped to the buffer
+        :rtype: list[tuple[int, int, int, int]]
+        """
+        tile = self.tile
+        rows: dict[int, list[int]] = {}
+        for column, row in self.dirty:
+            rows.setdefault(row, []).append(column)
+        rects = []
+        # the rectangle reaching down to each run of columns in the row of tiles above
+        above: dict[tuple[int, int], list[int]] = {}
+        for row in sorted(rows):
+            runs: list[list[int]] = []
+            for column in sorted(rows[row]):
+                if runs and runs[-1][1] == column:
+                    runs[-1][1] = column + 1
+                else:
+                    runs.append([column, column + 1])
+            current = {}
+            for start, end in runs:
+                rect = above.get((start, end))
+                if rect is not None and rect[3] == row:
+                    rect[3] = row + 1
+                else:
+                    rect = [start, row, end, row + 1]
+                    rects.append(rect)
+                current[start, end] = rect
+            above = current
+        self.dirty = set()
+        return [
+            (
+                x1 * tile,
+                y1 * tile,
+                min(x2 * tile, self.width),
+                min(y2 * tile, self.height),
+            )
+            for x1, y1, x2, y2 in rects
+        ]
+
+    def fill_rect(self, x1: int, y1: int, x2: int, y2: int, colour: int):
+        """Fill the pixels in [x1, x2) x [y1, y2), clipped to the buffer, with one colour.
+        """
+        x1, x2 = max(x1, 0), min(x2, self.width)
+        y1, y2 = max(y1, 0), min(y2, self.height)
+        if x1 >= x2 or y1 >= y2:
+            return
+        row = colour.to_bytes(3, "big") * (x2 - x1)
+        stride = self.width * 3
+        start = y1 * stride + x1 * 3
+        for offset in range(start, start + (y2 - y1) * stride, stride):
+            self.data[offset : offset + len(row)] = row
+        self._touch(x1, y1, x2, y2)
+
+    def _span(self, y: int, x1: float, x2: float, colour: bytes):
+        """Fill the pixels of row y whose centres lie in [x1, x2).
+        """
+        x1 = max(math.ceil(x1 - 0.5), 0)
+        x2 = min(math.ceil(x2 - 0.5), self.width)
+        if 0 <= y < self.height and x1 < x2:
+            offset = (y * self.width + x1) * 3
+            self.data[offset : offset + (x2 - x1) * 3] = colour * (x2 - x1)
+
+    def _rows(self, y1: float, y2: float) -> range:
+        """The rows whose pixel centres lie in [y1, y2), clipped to the buffer.
+        """
+        return range(
+            max(math.ceil(y1 - 0.5), 0), min(math.ceil(y2 - 0.5), self.height)
+        )
+
+    def polygon(self, points: list[tuple[float, float]], colour: int):
+        """Fill a polygon using the even-odd rule.
+        """
+        if len(points) < 3:
+            return
+        rgb = colour.to_bytes(3, "big")
+        # (top, bottom, x at the top, change of x per row) of every edge, top one first
+        edges = []
+        for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+            if y1 > y2:
+                x1, y1, x2, y2 = x2, y2, x1, y1
+            if y1 < y2:
+                edges.append((y1, y2, x1, (x2 - x1) / (y2 - y1)))
+        edges.sort()
+        ys = [y for _, y in points]
+        # the edges crossing the centre of the row, which only change at their ends
+        active = []
+        next_edge = 0
+        for row in self._rows(min(ys), max(ys)):
+            centre = row + 0.5
+            while next_edge < len(edges) and edges[next_edge][0] <= centre:
+                active.append(edges[next_edge])
+                next_edge += 1
+            active = [edge for edge in active if centre < edge[1]]
+            crossings = sorted(
+                x + (centre - top) * slope for top, _, x, slope in active
+            )
+            for i in range(0, len(crossings) - 1, 2):
+                self._span(row, crossings[i], crossings[i + 1], rgb)
+        xs = [x for x, _ in points]
+        self._touch(min(xs) - 1, min(ys) - 1, max(xs) + 1, max(ys) + 1)
+
+    def lines(self, coords: tuple[float, ...], colour: int, width: float):
+        """Draw a line through all the points in the flat list of coordinates.
+
+        Long lines are drawn by Pillow on a mask in one go, which is much faster than
+        drawing their straight parts one by one.
+        """
+        if len(coords) <= 2 * _FEW_POINTS:
+            for i in range(0, len(coords) - 2, 2):
+                self.line(*coords[i : i + 4], colour, width)
+            return
+        xs, ys = coords[0::2], coords[1::2]
+        margin = width / 2 + 1
+        right = min(math.ceil(max(xs) + margin), self.width)
+        bottom = min(math.ceil(max(ys) + margin), self.height)
+        if right <= 0 or bottom <= 0:
+            return
+        # the mask starts at (0, 0), so the coordinates can be drawn as they are
+        mask = Image.new("1", (right, bottom), 0)
+        ImageDraw.Draw(mask).line(
+            list(coords), fill=1, width=max(round(width), 1), joint="curve"
+        )
+        left = max(math.floor(min(xs) - margin), 0)
+        top = max(math.floor(min(ys) - margin), 0)
+        self.fill_mask(mask.crop((left, top, right, bottom)), left, top, colour)
+
+    def segments(self, coords: tuple[float, ...], colours: array, width: float):
+        """Draw separate straight lines, 4 coordinates and a colour each, in one go.
+        """
+        layer, left, top = _segment_layer(
+            coords, colours, width, (self.width, self.height)
+        )
+        if layer is not None:
+            self.paste(layer, left, top)
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, colour: int, width: float):
+        """Draw a straight line with butt ends, like a Tk line item.
+        """
+        length = math.hypot(x2 - x1, y2 - y1)
+        if width > 1 and length > 0:
+            # a thick line is the rectangle around it
+            nx = -(y2 - y1) / length * width / 2
+            ny = (x2 - x1) / length * width / 2
+            self.polygon(
+                [
+                    (x1 + nx, y1 + ny),
+                    (x2 + nx, y2 + ny),
+                    (x2 - nx, y2 - ny),
+                    (x1 - nx, y1 - ny),
+                ],
+                colour,
+            )
+            return
+        rgb = colour.to_bytes(3, "big")
+        steps = max(round(max(abs(x2 - x1), abs(y2 - y1))), 1)
+        for i in range(steps + 1):
+            x = math.floor(x1 + (x2 - x1) * i / steps)
+            y = math.floor(y1 + (y2 - y1) * i / steps)
+            if 0 <= x < self.width and 0 <= y < self.height:
+                offset = (y * self.width + x) * 3
+                self.data[offset : offset + 3] = rgb
+        self._touch(min(x1, x2), min(y1, y2), max(x1, x2) + 1, max(y1, y2) + 1)
+
+    def ellipse(
+        self, x1: float, y1: float, x2: float, y2: float, colour: int, width: float = 0
+    ):
+        """Draw the ellipse inscribed in the (x1, y1, x2, y2) box.
+
+        :param width: width of the outline, or 0 for a filled ellipse
+        :type width: float
+        """
+        rgb = colour.to_bytes(3, "big")
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        rx, ry = abs(x2 - x1) / 2 + width / 2, abs(y2 - y1) / 2 + width / 2
+        if rx <= 0 or ry <= 0:
+            return
+        # the spans only depend on where the centre is within its pixel
+        left, top = math.floor(cx), math.floor(cy)
+        stride = self.width * 3
+        for dy, start, end in _ellipse_spans(rx, ry, width, cx - left, cy - top):
+            y = top + dy
+            start, end = max(left + start, 0), min(left + end, self.width)
+            if 0 <= y < self.height and start < end:
+                offset = y * stride + start * 3
+                self.data[offset : offset + (end - start) * 3] = rgb * (end - start)
+        self._touch(cx - rx - 1, cy - ry - 1, cx + rx + 1, cy + ry + 1)
+
+    def _gather(self, columns: list[int]) -> callable:
+        """Return a function picking the given columns from a row, white where they fall outside.
+        """
+        # columns outside the buffer pick from a white pixel appended to the row
+        pick = itemgetter(
+            *(
+                (x if 0 <= x < self.width else self.width) * 3 + c
+                for x in columns
+                for c in range(3)
+            )
+        )
+        white_pixel = white.to_bytes(3, "big")
+        return lambda line: bytes(pick(line + white_pixel))
+
+    def get(self, x: int, y: int) -> int:
+        """Return the colour of the pixel at (x, y) as an rgb integer, white outside the buffer.
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return white
+        offset = (y * self.width + x) * 3
+        return int.from_bytes(self.data[offset : offset + 3], "big")
+
+    def region_rgb(self, columns: list[int], rows: list[int]) -> list[bytes]:
+        """Return the pixels at every (column, row) pair as packed RGB bytes, one row at a time.
+        """
+        stride = self.width * 3
+        gather = self._gather(columns)
+        blank_row = white.to_bytes(3, "big") * len(columns)
+        return [
+            gather(self.data[y * stride : (y + 1) * stride])
+            if 0 <= y < self.height
+            else blank_row
+            for y in rows
+        ]
+
+    def blit(
+        self,
+        x: float,
+        y: float,
+        rgb: bytes,
+        w: int,
+        h: int,
+        x_factor: float = 1,
+        y_factor: float = 1,
+    ) -> tuple[int, int, int, int]:
+        """Copy a w by h block of packed RGB pixels to (x, y), stretching each pixel by the factors.
+
+        :return: the rectangle of the buffer that was written, clipped to the buffer
+        :rtype: tuple[int, int, int, int]
+        """
+        x1, x2 = round(x), round(x + w * x_factor)
+        y1, y2 = round(y), round(y + h * y_factor)
+        left, right = max(x1, 0), min(x2, self.width)
+        top, bottom = max(y1, 0), min(y2, self.height)
+        if left >= right or top >= bottom:
+            return left, top, left, top
+        if x_factor == 1:
+            source = (left - x1) * 3
+            pick = lambda line: line[source : source + (right - left) * 3]
+        else:
+            columns = [
+                min(int((dx + 0.5 - x) / x_factor), w - 1) for dx in range(left, right)
+            ]
+            gather = itemgetter(*(c * 3 + k for c in columns for k in range(3)))
+            pick = lambda line: bytes(gather(line))
+        stride = self.width * 3
+        source_row, row = None, b""
+        for dy in range(top, bottom):
+            sy = min(int((dy + 0.5 - y) / y_factor), h - 1)
+            if sy != source_row:
+                source_row = sy
+                row = pick(rgb[sy * w * 3 : (sy + 1) * w * 3])
+            offset = dy * stride + left * 3
+            self.data[offset : offset + len(row)] = row
+        self._touch(left, top, right, bottom)
+        return left, top, right, bottom
+
+    def crop(self, x1: int, y1: int, x2: int, y2: int) -> bytes:
+        """Return the pixels in [x1, x2) x [y1, y2) as packed RGB bytes.
+        """
+        stride = self.width * 3
+        return b"".join(
+            self.data[y * stride + x1 * 3 : y * stride + x2 * 3] for y in range(y1, y2)
+        )
+
+    def crop_ppm(self, x1: int, y1: int, x2: int, y2: int) -> bytes:
+        """Return the pixels in [x1, x2) x [y1, y2) as binary PPM data.
+        """
+        return b"P6 %d %d 255\n" % (x2 - x1, y2 - y1) + self.crop(x1, y1, x2, y2)
+
+    def _composite(self, x: int, y: int, width: int, height: int, draw: callable):
+        """Redraw the w by h block of pixels at (x, y) with Pillow.
+
+        :param draw: called with the block as a Pillow image and the offset of (x, y) in
+            it, which is not 0 where the block is clipped to the buffer
+        :type draw: callable
+        """
+        left, right = max(x, 0), min(x + width, self.width)
+        top, bottom = max(y, 0), min(y + height, self.height)
+        if left >= right or top >= bottom:
+            return
+        below = Image.frombytes(
+            "RGB", (right - left, bottom - top), self.crop(left, top, right, bottom)
+        )
+        draw(below, x - left, y - top)
+        rgb = below.tobytes()
+        stride = self.width * 3
+        size = (right - left) * 3
+        for i, row in enumerate(range(top, bottom)):
+            offset = row * stride + left * 3
+            self.data[offset : offset + size] = rgb[i * size : (i + 1) * size]
+        self._touch(left, top, right, bottom)
+
+    def paste(self, layer: Image.Image, x: int, y: int):
+        """Draw an RGBA Pillow image with its top left corner at (x, y), where it is opaque.
+        """
+        self._composite(
+            x,
+            y,
+            layer.width,
+            layer.height,
+            lambda below, dx, dy: below.paste(layer, (dx, dy), layer),
+        )
+
+    def fill_mask(self, mask: Image.Image, x: int, y: int, colour: int):
+        """Fill the pixels set in a Pillow mask with its top left corner at (x, y).
+        """
+        self._composite(
+            x,
+            y,
+            mask.width,
+            mask.height,
+            lambda below, dx, dy: below.paste(
+                _colour_tuple(colour), (dx, dy, dx + mask.width, dy + mask.height), mask
+            ),
+        )
+
+    def ppm(self) -> bytes:
+        """Return the whole buffer as binary PPM data, the format PhotoImage reads fastest.
+        """
+        return b"P6 %d %d 255\n" % (self.width, self.height) + self.data
+
+
+# lines with more points than this are drawn on the framebuffer by Pillow
+_FEW_POINTS = 16
+
+
+@lru_cache(maxsize=256)
+def _ellipse_spans(
+    rx: float, ry: float, width: float, fx: float, fy: float
+) -> tuple[tuple[int, int, int], ...]:
+    """Private. The spans of pixels whose centres lie in an ellipse, or its outline.
+
+    The ellipse has radii rx and ry, including the outline, and its centre is (fx, fy)
+    from the top left corner of a pixel, so the same shape in the same place within a
+    pixel is only worked out once. Blots and circles of one size are usually drawn at
+    whole coordinates.
+
+    :param width: width of the outline, or 0 for a filled ellipse
+    :type width: float
+    :return: (row, first column, end column) of each span, from the pixel of the centre
+    :rtype: tuple[tuple[int, int, int], ...]
+    """
+    spans = []
+    inner_rx, inner_ry = rx - width, ry - width
+    for row in range(math.ceil(fy - ry - 0.5), math.ceil(fy + ry - 0.5)):
+        dy = row + 0.5 - fy
+        half = rx * math.sqrt(max(1 - (dy / ry) ** 2, 0))
+        if width and inner_rx > 0 and inner_ry > 0 and abs(dy) < inner_ry:
+            # an outline row is two spans either side of the hole
+            hole = inner_rx * math.sqrt(1 - (dy / inner_ry) ** 2)
+            parts = ((fx - half, fx - hole), (fx + hole, fx + half))
+        else:
+            parts = ((fx - half, fx + half),)
+        for x1, x2 in parts:
+            start, end = math.ceil(x1 - 0.5), math.ceil(x2 - 0.5)
+            if start < end:
+                spans.append((row, start, end))
+    return tuple(spans)
+
+
+def _separate_lines(
+    draw: ImageDraw.ImageDraw, coords: tuple[float, ...], colours: array, width: float
+):
+    """Private. Draw separate straight lines, 4 coordinates and a colour each, with Pillow.
+
+    Pillow's drawing core is called directly and without a loop in Python, skipping the
+    checks ImageDraw.line makes for every line, with the ink of each colour worked out
+    once. The core is private to Pillow, so ImageDraw.line draws the lines instead when
+    a release of Pillow does not have the calls used.
+    """
+    core = getattr(draw, "draw", None)
+    lines = zip(*[iter(coords)] * 4)
+    width = max(round(width), 1)
+    if not (hasattr(core, "draw_ink") and hasattr(core, "draw_lines")):
+        fills = {colour: _colour_tuple(colour) + (255,) for colour in set(colours)}
+        for line, colour in zip(lines, colours):
+            draw.line(line, fill=fills[colour], width=width)
+        return
+    inks = {
+        colour: core.draw_ink(_colour_tuple(colour) + (255,)) for colour in set(colours)
+    }
+    if len(inks) == 1:
+        ink = repeat(inks.popitem()[1])
+    else:
+        ink = map(inks.__getitem__, colours)
+    # draw_lines returns None for every line
+    deque(map(core.draw_lines, lines, ink, repeat(width)), maxlen=0)
+
+
+def _segment_layer(
+    coords: tuple[float, ...],
+    colours: array,
+    width: float,
+    size: tuple[int, int],
+) -> tuple[Image.Image | None, int, int]:
+    """Private. Draw separate straight lines on a transparent image just big enough for them.
+
+    :param size: the width and height of the canvas, which the image is clipped to
+    :type size: tuple[int, int]
+    :return: the image and the position of its top left corner, or None if no lines are
+        on the canvas
+    :rtype: tuple[Image.Image | None, int, int]
+    """
+    if not colours:
+        return None, 0, 0
+    margin = math.ceil(width / 2) + 1
+    xs, ys = coords[0::2], coords[1::2]
+    left = max(math.floor(min(xs)) - margin, 0)
+    top = max(math.floor(min(ys)) - margin, 0)
+    right = min(math.ceil(max(xs)) + margin, size[0])
+    bottom = min(math.ceil(max(ys)) + margin, size[1])
+    if left >= right or top >= bottom:
+        return None, 0, 0
+    # the layer starts at (0, 0), so the coordinates can be drawn as they are
+    layer = Image.new("RGBA", (right, bottom), (0, 0, 0, 0))
+    _separate_lines(ImageDraw.Draw(layer), coords, colours, width)
+    return layer.crop((left, top, right, bottom)), left, top
+
+
+class _TkBackend:
+    """Private. Draws on a Tk canvas in a window.
+
+    Every drawing is also rasterized into a framebuffer that pixcol reads from. In raster
+    mode drawings only go into that framebuffer, which is shown through a single
+    PhotoImage, so the canvas keeps one item whatever is drawn on it. The framebuffer
+    then only has as many pixels as the resolution of the canvas: each one is drawn
+    once, and scaled up to the window when it is shown.
+    """
+
+    headless = False
+
+    def __init__(self, width: int, height: int, raster: bool = False):
+        """
+        :param width: the width of the canvas
+        :type width: int
+        :param height: the height of the canvas
+        :type height: int
+        :param raster: draw everything in a single image instead of canvas items
+        :type raster: bool
+        """
+        # fonts are in a submodule, which importing tkinter does not import
+        import tkinter.font
+
+        self.root = tkinter.Tk()
+        self.root.title("Turtle")
+
+        self.frame = tkinter.Frame(self.root, width=width, height=height + 100)
+        self.frame.pack(expand=True, fill="both")
+        self.halt = tkinter.Button(self.frame, text="HALT")
+        self.halt.pack()
+
+        self.canvas = tkinter.Canvas(self.frame, bg="white", width=width, height=height)
+        self.canvas.pack(side="bottom")
+        self.width = width
+        self.height = height
+        self.raster = raster
+        # window pixels per framebuffer pixel across and down, see set_resolution()
+        self.scale = (1.0, 1.0)
+        self.pixels = _Framebuffer(width, height)
+        self.image = None
+        self.image_id = -1
+        # Images shown on vector canvases, kept alive while shown, with the rectangle they
+        # cover by the id of their item
+        self.images: dict[int, tuple[tkinter.Image, int, int, int, int]] = {}
+        # window pixels per unit of the resolution across and down
+        self.multipliers = (1.0, 1.0)
+        # Counts the other shapes drawn, which may cover pixel items
+        self.generation = 0
+        self._forget_pixels()
+        # Tk numbers items from 1 up, so the highest id is the number of items created
+        self.created = 0
+        # bytes of pixels sent to the raster image, in all and by the last refresh
+        self.uploaded = 0
+        self.last_upload = 0
+        # Tk fonts by (family, size), so Tk resolves each font only once
+        self.fonts: dict[tuple[str, int], tkinter.font.Font] = {}
+        # (width, height) of the texts displayed, by (text, family, size)
+        self.text_sizes: dict[tuple[str, str, int], tuple[int, int]] = {}
+        if raster:
+            self.image = tkinter.PhotoImage(width=width, height=height)
+            self.image_id = self.canvas.create_image(0, 0, anchor="nw", image=self.image)
+        self.canvas.focus_set()
+        # written to wake up wait(), 1 by notify() and -1 when the time is up
+        self.signal = tkinter.IntVar(self.root)
+        # set once the window is destroyed, by its close button, halt() or mainloop()
+        self.closed = False
+        self.root.bind("<Destroy>", self._destroyed, add=True)
+        self.halt.bind("<ButtonRelease>", halt)
+
+    def _destroyed(self, event: tkinter.Event):
+        """Wake up wait() when the window is closed, as no other event can come any more.
+        """
+        # the bindings of the root also get the Destroy events of its widgets
+        if event.widget is self.root:
+            self.closed = True
+            self.notify()
+
+    def _drawn(self, id: int) -> int:
+        """Note that a shape which may cover pixel items was drawn.
+        """
+        self.generation += 1
+        self.created = max(self.created, id)
+        return id
+
+    def _show_image(
+        self, image: tkinter.Image, left: int, top: int, right: int, bottom: int
+    ) -> int:
+        """Show an image with its top left corner at (left, top) on a vector canvas.
+        """
+        id = self._drawn(self.canvas.create_image(left, top, anchor="nw", image=image))
+        self.images[id] = (image, left, top, right, bottom)
+        return id
+
+    def _cover_images(self, left: float, top: float, right: float, bottom: float):
+        """Delete the images hidden by an opaque shape drawn over a rectangle.
+
+        Programs blitting the same block or stepping a Swarm over and over then keep as
+        many images as can be seen, not one for every time they drew.
+        """
+        hidden = [
+            id
+            for id, (_, x1, y1, x2, y2) in self.images.items()
+            if left <= x1 and top <= y1 and x2 <= right and y2 <= bottom
+        ]
+        if hidden:
+            self.canvas.delete(*hidden)
+            for id in hidden:
+                del self.images[id]
+
+    def _forget_pixels(self):
+        """Forget the items showing pixels on a vector canvas, after they were deleted.
+        """
+        # The item showing each pixel of the resolution, and the generation it was raised
+        # in, so setting a pixel again recolours it instead of stacking items. Made when
+        # the first one is set
+        self.pixel_ids = array("I")
+        self.pixel_raised = array("Q")
+        # The same for pixels between those of the resolution, by their rectangle
+        self.pixel_items: dict[tuple[float, float, float, float], tuple[int, int]] = {}
+
+    def _pixel_item(self, x1: float, y1: float) -> int:
+        """Return the index in pixel_ids of the pixel at (x1, y1), or -1 if it has none.
+        """
+        x_multiplier, y_multiplier = self.multipliers
+        x, y = x1 / x_multiplier, y1 / y_multiplier
+        columns = round(self.width / x_multiplier)
+        rows = round(self.height / y_multiplier)
+        if not (0 <= x < columns and 0 <= y < rows and x % 1 == y % 1 == 0):
+            return -1
+        if not self.pixel_ids:
+            self.pixel_ids = array("I", [0]) * (columns * rows)
+            self.pixel_raised = array("Q", [0]) * (columns * rows)
+        return int(y) * columns + int(x)
+
+    def set_resolution(self, x_multiplier: float, y_multiplier: float):
+        """Give a raster framebuffer one pixel per unit of the resolution of the canvas.
+
+        Drawing at a low resolution, such as 32 by 32 in a 900 by 900 window, then only
+        writes and keeps the pixels of the resolution. Vector canvases, and resolutions
+        finer than the window, keep a pixel per window pixel. Clears the framebuffer,
+        the drawing has to be replayed.
+
+        :param x_multiplier: window pixels per unit of the resolution across
+        :type x_multiplier: float
+        :param y_multiplier: window pixels per unit of the resolution down
+        :type y_multiplier: float
+        """
+        self.multipliers = (x_multiplier, y_multiplier)
+        self._forget_pixels()
+        if self.raster and x_multiplier >= 1 and y_multiplier >= 1:
+            self.scale = (x_multiplier, y_multiplier)
+        else:
+            self.scale = (1.0, 1.0)
+        self.pixels = self._framebuffer()
+
+    def _framebuffer(self) -> _Framebuffer:
+        """Return a new framebuffer for the size of the canvas and the scale.
+        """
+        x_scale, y_scale = self.scale
+        pixels = _Framebuffer(
+            max(round(self.width / x_scale), 1), max(round(self.height / y_scale), 1)
+        )
+        # tiles about as big in the window as without a scale, so a change to a few
+        # pixels does not send most of the window again
+        pixels.tile = max(_Framebuffer.tile // round(max(x_scale, y_scale)), 1)
+        return pixels
+
+    def _in_pixels(self, *coords: float) -> tuple[float, ...]:
+        """Convert x, y, x, y... window coordinates to coordinates in the framebuffer.
+        """
+        if self.scale == (1.0, 1.0):
+            return coords
+        scale = self.scale
+        return tuple(c / scale[i & 1] for i, c in enumerate(coords))
+
+    def item_count(self) -> int:
+        """Count the items on the canvas.
+        """
+        return len(self.canvas.find_all())
+
+    def line(self, coords: tuple[float, ...], colour: int, width: float) -> int:
+        """Draw a line through all the points in the flat list of coordinates, as one item.
+        """
+        self.pixels.lines(self._in_pixels(*coords), colour, width / self.scale[0])
+        if self.raster:
+            return self.image_id
+        return self._drawn(
+            self.canvas.create_line(*coords, fill=colour_to_str(colour), width=width)
+        )
+
+    def extend_line(
+        self, id: int, coords: tuple[float, ...], colour: int, width: float
+    ) -> int:
+        """Continue a line drawn before from its last point, the first in coords.
+        """
+        self.pixels.lines(self._in_pixels(*coords), colour, width / self.scale[0])
+        if self.raster:
+            return self.image_id
+        self.canvas.insert(id, "end", coords[2:])
+        return self._drawn(id)
+
+    def oval(
+        self, x1: float, y1: float, x2: float, y2: float, colour: int, width: float = 0
+    ) -> int:
+        """Draw the outline of an oval, or a filled oval when the width is 0.
+        """
+        self.pixels.ellipse(
+            *self._in_pixels(x1, y1, x2, y2), colour, width / self.scale[0]
+        )
+        if self.raster:
+            return self.image_id
+        if width:
+            return self._drawn(
+                self.canvas.create_oval(
+                    x1, y1, x2, y2, width=width, outline=colour_to_str(colour)
+                )
+            )
+        return self._drawn(
+            self.canvas.create_oval(x1, y1, x2, y2, width=0, fill=colour_to_str(colour))
+        )
+
+    def pixel(self, x1: float, y1: float, x2: float, y2: float, colour: int) -> int:
+        self.pixels.fill_rect(*map(round, self._in_pixels(x1, y1, x2, y2)), colour)
+        if self.raster:
+            return self.image_id
+        cell = self._pixel_item(x1, y1)
+        if cell >= 0:
+            id, generation = self.pixel_ids[cell], self.pixel_raised[cell]
+        else:
+            id, generation = self.pixel_items.get((x1, y1, x2, y2), (0, 0))
+        if not id:
+            id = self.canvas.create_rectangle(
+                x1, y1, x2, y2, fill=colour_to_str(colour), width=0
+            )
+            self.created = id
+        else:
+            self.canvas.itemconfigure(id, fill=colour_to_str(colour))
+            if generation == self.generation:
+                return id
+            # shapes drawn since may cover the pixel, a new pixel would go on top of them
+            self.canvas.tag_raise(id)
+        if cell >= 0:
+            self.pixel_ids[cell] = id
+            self.pixel_raised[cell] = self.generation
+        else:
+            self.pixel_items[x1, y1, x2, y2] = (id, self.generation)
+        return id
+
+    def rectangle(
+        self, x1: float, y1: float, x2: float, y2: float, colour: int, width: float = 0
+    ) -> int:
+        """Draw a filled rectangle, with a black border when the width is not 0.
+        """
+        self.pixels.fill_rect(*map(round, self._in_pixels(x1, y1, x2, y2)), colour)
+        if width:
+            # Tk centres the (default black) outline on the edges of the rectangle. Like
+            # lines and ovals, each edge is at least one framebuffer pixel wide, even
+            # when the border is thinner than a pixel of a coarse resolution
+            left, top, right, bottom = self._in_pixels(x1, y1, x2, y2)
+            left, right = sorted((left, right))
+            top, bottom = sorted((top, bottom))
+            half_x = max(width / self.scale[0], 1) / 2
+            half_y = max(width / self.scale[1], 1) / 2
+            for edge in (
+                (left - half_x, top - half_y, right + half_x, top + half_y),
+                (left - half_x, bottom - half_y, right + half_x, bottom + half_y),
+                (left - half_x, top - half_y, left + half_x, bottom + half_y),
+                (right - half_x, top - half_y, right + half_x, bottom + half_y),
+            ):
+                # halves rounded up, so edges meeting at a corner both reach it
+                ex1, ey1, ex2, ey2 = (math.floor(c + 0.5) for c in edge)
+                self.pixels.fill_rect(
+                    ex1, ey1, max(ex2, ex1 + 1), max(ey2, ey1 + 1), black
+                )
+        if self.raster:
+            return self.image_id
+        self._cover_images(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        return self._drawn(
+            self.canvas.create_rectangle(
+                x1, y1, x2, y2, fill=colour_to_str(colour), width=width
+            )
+        )
+
+    def polygon(self, points: list[tuple[float, float]], colour: int) -> int:
+        if self.scale == (1.0, 1.0):
+            self.pixels.polygon(points, colour)
+        else:
+            x_scale, y_scale = self.scale
+            self.pixels.polygon([(x / x_scale, y / y_scale) for x, y in points], colour)
+        if self.raster:
+            return self.image_id
+        return self._drawn(
+            self.canvas.create_polygon(*points, fill=colour_to_str(colour))
+        )
+
+    def fill_rects(
+        self, rects: list[tuple[float, float, float, float]], colour: int
+    ) -> int:
+        """Fill a set of rectangles, such as the spans of a flood fill, as one image item.
+        """
+        if self.raster:
+            for rect in rects:
+                self.pixels.fill_rect(*map(round, self._in_pixels(*rect)), colour)
+            return self.image_id
+        rects = [tuple(map(round, rect)) for rect in rects]
+        for rect in rects:
+            self.pixels.fill_rect(*rect, colour)
+        left = min(rect[0] for rect in rects)
+        top = min(rect[1] for rect in rects)
+        right = max(rect[2] for rect in rects)
+        bottom = max(rect[3] for rect in rects)
+        if left >= right or top >= bottom:
+            return -1
+        # a bitmap is transparent where it is not set, so the shape of the fill shows
+        mask = Image.new("1", (right - left, bottom - top), 0)
+        for x1, y1, x2, y2 in rects:
+            if x1 < x2 and y1 < y2:
+                mask.paste(255, (x1 - left, y1 - top, x2 - left, y2 - top))
+        image = tkinter.BitmapImage(
+            data=mask.tobitmap().decode(), foreground=colour_to_str(colour)
+        )
+        return self._show_image(image, left, top, right, bottom)
+
+    def segments(
+        self, coords: tuple[float, ...], colours: array, width: float
+    ) -> int:
+        """Draw separate straight lines, 4 coordinates each, as one image item.
+        """
+        if self.raster:
+            self.pixels.segments(self._in_pixels(*coords), colours, width / self.scale[0])
+            return self.image_id
+        layer, left, top = _segment_layer(coords, colours, width, (self.width, self.height))
+        if layer is None:
+            return -1
+        self.pixels.paste(layer, left, top)
+        # PNG keeps the transparent pixels between the lines
+        data = io.BytesIO()
+        layer.save(data, "png", compress_level=1)
+        image = tkinter.PhotoImage(data=data.getvalue(), format="png")
+        return self._show_image(
+            image, left, top, left + layer.width, top + layer.height
+        )
+
+    def _font(self, font: str, size: int) -> tkinter.font.Font:
+        """Return the Tk font of a family and size, made the first time it is asked for.
+        """
+        key = (str(font), size)
+        tk_font = self.fonts.get(key)
+        if tk_font is None:
+            tk_font = tkinter.font.Font(root=self.root, family=key[0], size=size)
+            self.fonts[key] = tk_font
+        return tk_font
+
+    def text_size(self, text: str, font: str, size: int) -> tuple[int, int]:
+        """Return the width and height in pixels of a text displayed in a font.
+        """
+        if self.raster:
+            # Pillow draws the texts of raster canvases
+            return _text_size(text, str(font), _font_pixels(size))
+        key = (text, str(font), size)
+        text_size = self.text_sizes.get(key)
+        if text_size is None:
+            tk_font = self._font(font, size)
+            lines = text.split("\n")
+            text_size = (
+                max(tk_font.measure(line) for line in lines),
+                tk_font.metrics("linespace") * len(lines),
+            )
+            if len(self.text_sizes) >= 4096:
+                self.text_sizes.clear()
+            self.text_sizes[key] = text_size
+        return text_size
+
+    def text(self, x: float, y: float, text: str, font: str, size: int, colour: int) -> int:
+        if self.raster:
+            # drawn by Pillow like on the pillow backend, at the scale of the framebuffer
+            x_scale, y_scale = self.scale
+            pixels = max(round(_font_pixels(size) / x_scale), 1)
+            mask, left, top = _text_mask(str(text), str(font), pixels)
+            if mask is not None:
+                self.pixels.fill_mask(
+                    mask, round(x / x_scale) + left, round(y / y_scale) + top, colour
+                )
+            return self.image_id
+        t = self.canvas.create_text(
+            x,
+            y,
+            anchor="nw",
+            font=self._font(font, size),
+            fill=colour_to_str(colour),
+            text=text,
+        )
+        # the shadow pixels only know the area covered by the text
+        width, height = self.text_size(str(text), font, size)
+        x1, y1 = round(x), round(y)
+        x1, y1, x2, y2 = self._in_pixels(x1, y1, x1 + width, y1 + height)
+        self.pixels.fill_rect(round(x1), round(y1), round(x2), round(y2), colour)
+        return self._drawn(t)
+
+    def clear(self, colour: int) -> int:
+        self.pixels.fill_rect(0, 0, self.pixels.width, self.pixels.height, colour)
+        if self.raster:
+            return self.image_id
+        # everything drawn so far is covered, so the items can go
+        self.canvas.delete("all")
+        self.images = {}
+        self._forget_pixels()
+        return self._drawn(
+            self.canvas.create_rectangle(
+                0, 0, self.width, self.height, fill=colour_to_str(colour), width=0
+            )
+        )
+
+    def blit(
+        self,
+        x: float,
+        y: float,
+        rgb: bytes,
+        w: int,
+        h: int,
+        x_factor: float,
+        y_factor: float,
+    ) -> int:
+        if self.raster:
+            x_scale, y_scale = self.scale
+            x, y = x / x_scale, y / y_scale
+            self.pixels.blit(x, y, rgb, w, h, x_factor / x_scale, y_factor / y_scale)
+            return self.image_id
+        left, top, right, bottom = self.pixels.blit(x, y, rgb, w, h, x_factor, y_factor)
+        if left >= right or top >= bottom:
+            return -1
+        # a single image item shows the whole block on a vector canvas
+        image = tkinter.PhotoImage(
+            data=self.pixels.crop_ppm(left, top, right, bottom)
+        )
+        # the block is opaque, the images under it cannot be seen any more
+        self._cover_images(left, top, right, bottom)
+        return self._show_image(image, left, top, right, bottom)
+
+    def colour_at(self, x: int, y: int) -> int:
+        x_scale, y_scale = self.scale
+        return self.pixels.get(int(x / x_scale), int(y / y_scale))
+
+    def region_rgb(self, columns: list[int], rows: list[int]) -> list[bytes]:
+        if self.scale != (1.0, 1.0):
+            x_scale, y_scale = self.scale
+            columns = [int(x / x_scale) for x in columns]
+            rows = [int(y / y_scale) for y in rows]
+        return self.pixels.region_rgb(columns, rows)
+
+    def reset(self, width: int, height: int):
+        """Remove everything from the canvas and give it a new size.
+        """
+        self.width = width
+        self.height = height
+        self.canvas.delete("all")
+        self.canvas.configure(width=width, height=height)
+        self.pixels = self._framebuffer()
+        self.images = {}
+        self._forget_pixels()
+        if self.raster:
+            self.image = tkinter.PhotoImage(width=width, height=height)
+            self.image_id = self.canvas.create_image(0, 0, anchor="nw", image=self.image)
+
+    def refresh(self):
+        if self.raster:
+            # only the parts drawn on since the last refresh go to Tk
+            uploaded = 0
+            x_scale, y_scale = self.scale
+            for x1, y1, x2, y2 in self.pixels.take_dirty():
+                if self.scale == (1.0, 1.0):
+                    data = self.pixels.crop_ppm(x1, y1, x2, y2)
+                else:
+                    # each framebuffer pixel becomes a block of the window
+                    data, x1, y1 = self._scaled_ppm(x1, y1, x2, y2)
+                self.image.put(data, to=(x1, y1))
+                uploaded += len(data)
+            self.uploaded += uploaded
+            self.last_upload = uploaded
+        self.root.update()
+
+    def _scaled_ppm(
+        self, x1: int, y1: int, x2: int, y2: int
+    ) -> tuple[bytes, int, int]:
+        """Scale a part of a framebuffer with a scale up to the window, as PPM data.
+
+        PhotoImage.zoom only takes whole factors, Pillow resizes to the nearest pixel.
+
+        :return: the data and the window coordinates of its top left corner
+        :rtype: tuple[bytes, int, int]
+        """
+        x_scale, y_scale = self.scale
+        left, top = round(x1 * x_scale), round(y1 * y_scale)
+        right = min(round(x2 * x_scale), self.width)
+        bottom = min(round(y2 * y_scale), self.height)
+        part = Image.frombytes(
+            "RGB", (x2 - x1, y2 - y1), self.pixels.crop(x1, y1, x2, y2)
+        ).resize((right - left, bottom - top), Image.NEAREST)
+        header = b"P6 %d %d 255\n" % part.size
+        return header + part.tobytes(), left, top
+
+    def poll(self):
+        """Handle the pending events without showing new pixels of a raster canvas.
+        """
+        self.root.update()
+
+    def mainloop(self):
+        # show the drawings still waiting for a refresh before handing over to Tk
+        self.refresh()
+        self.canvas.mainloop()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Handle events until notify() is called or the timeout in milliseconds passes.
+
+        :return: True if woken up by notify()
+        :rtype: bool
+        :raises tkinter.TclError: if the window is closed, before or during the wait
+        """
+        if self.closed:
+            raise tkinter.TclError("the window was closed")
+        self.signal.set(0)
+        timer = None
+        if timeout is not None:
+            timer = self.root.after(max(round(timeout), 1), self.signal.set, -1)
+        self.root.wait_variable(self.signal)
+        if self.closed:
+            raise tkinter.TclError("the window was closed")
+        if timer is not None:
+            self.root.after_cancel(timer)
+        return self.signal.get() == 1
+
+    def notify(self):
+        """Wake up wait() from an event handler.
+        """
+        self.signal.set(1)
+
+
+class _PillowBackend:
+    """Private. Draws off screen on a Pillow image, without a window or an event loop.
+    """
+
+    headless = True
+
+    def __init__(self, width: int, height: int, raster: bool = False):
+        """
+        :param width: the width of the canvas
+        :type width: int
+        :param height: the height of the canvas
+        :type height: int
+        :param raster: ignored, the image always holds the pixels
+        :type raster: bool
+        """
+        self.width = width
+        self.height = height
+        self.image = Image.new("RGB", (width, height), "white")
+        self.draw = ImageDraw.Draw(self.image)
+        # Pillow has no items, so ids just count the drawings and none are created
+        self.drawings = 0
+        self.created = 0
+        # nothing is ever sent to a window
+        self.uploaded = 0
+        self.last_upload = 0
+
+    def _id(self) -> int:
+        self.drawings += 1
+        return self.drawings
+
+    def set_resolution(self, x_multiplier: float, y_multiplier: float):
+        """Do nothing, the image is the picture saved and always has every pixel.
+        """
+
+    def item_count(self) -> int:
+        """Count the items on the canvas, none as everything is drawn straight on the image.
+        """
+        return 0
+
+    def line(self, coords: tuple[float, ...], colour: int, width: float) -> int:
+        """Draw a line through all the points in the flat list of coordinates.
+        """
+        self.draw.line(
+            coords, fill=_colour_tuple(colour), width=max(round(width), 1), joint="curve"
+        )
+        return self._id()
+
+    def extend_line(
+        self, id: int, coords: tuple[float, ...], colour: int, width: float
+    ) -> int:
+        """Continue a line drawn before from its last point, the first in coords.
+        """
+        self.draw.line(
+            coords, fill=_colour_tuple(colour), width=max(round(width), 1), joint="curve"
+        )
+        return id
+
+    def oval(
+        self, x1: float, y1: float, x2: float, y2: float, colour: int, width: float = 0
+    ) -> int:
+        x1, x2 = sorted((x1, x2))
+        y1, y2 = sorted((y1, y2))
+        if width:
+            # Pillow draws the outline inside the box, Tk centres it on the edge
+            half = width / 2
+            self.draw.ellipse(
+                (x1 - half, y1 - half, x2 + half, y2 + half),
+                outline=_colour_tuple(colour),
+                width=max(round(width), 1),
+            )
+        else:
+            self.draw.ellipse((x1, y1, x2, y2), fill=_colour_tuple(colour))
+        return self._id()
+
+    def pixel(self, x1: float, y1: float, x2: float, y2: float, colour: int) -> int:
+        self.image.paste(_colour_tuple(colour), (round(x1), round(y1), round(x2), round(y2)))
+        return self._id()
+
+    def rectangle(
+        self, x1: float, y1: float, x2: float, y2: float, colour: int, width: float = 0
+    ) -> int:
+        x1, x2 = sorted((x1, x2))
+        y1, y2 = sorted((y1, y2))
+        self.draw.rectangle((x1, y1, x2 - 1, y2 - 1), fill=_colour_tuple(colour))
+        if width:
+            half = width / 2
+            self.draw.rectangle(
+                (x1 - half, y1 - half, x2 + half, y2 + half),
+                outline="black",
+                width=max(round(width), 1),
+            )
+        return self._id()
+
+    def polygon(self, points: list[tuple[float, float]], colour: int) -> int:
+        if len(points) > 1:
+            self.draw.polygon(points, fill=_colour_tuple(colour))
+        return self._id()
+
+    def fill_rects(
+        self, rects: list[tuple[float, float, float, float]], colour: int
+    ) -> int:
+        for rect in rects:
+            self.image.paste(_colour_tuple(colour), tuple(map(round, rect)))
+        return self._id()
+
+    def segments(
+        self, coords: tuple[float, ...], colours: array, width: float
+    ) -> int:
+        """Draw separate straight lines, 4 coordinates each.
+        """
+        _separate_lines(self.draw, coords, colours, width)
+        return self._id()
+
+    def text_size(self, text: str, font: str, size: int) -> tuple[int, int]:
+        """Return the width and height in pixels of a text displayed in a font.
+        """
+        return _text_size(text, str(font), _font_pixels(size))
+
+    def text(self, x: float, y: float, text: str, font: str, size: int, colour: int) -> int:
+        # the same text in the same font is only rendered once
+        mask, left, top = _text_mask(str(text), str(font), _font_pixels(size))
+        if mask is not None:
+            x, y = round(x) + left, round(y) + top
+            self.image.paste(
+                _colour_tuple(colour), (x, y, x + mask.width, y + mask.height), mask
+            )
+        return self._id()
+
+    def clear(self, colour: int) -> int:
+        self.image.paste(_colour_tuple(colour), (0, 0, self.width, self.height))
+        return self._id()
+
+    def blit(
+        self,
+        x: float,
+        y: float,
+        rgb: bytes,
+        w: int,
+        h: int,
+        x_factor: float,
+        y_factor: float,
+    ) -> int:
+        block = Image.frombytes("RGB", (w, h), bytes(rgb))
+        left, top = round(x), round(y)
+        size = (round(x + w * x_factor) - left, round(y + h * y_factor) - top)
+        if size[0] <= 0 or size[1] <= 0:
+            return -1
+        if size != block.size:
+            block = block.resize(size, Image.NEAREST)
+        self.image.paste(block, (left, top))
+        return self._id()
+
+    def colour_at(self, x: int, y: int) -> int:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return white
+        return colour_to_int(self.image.getpixel((x, y)))
+
+    def region_rgb(self, columns: list[int], rows: list[int]) -> list[bytes]:
+        xs = [x for x in columns if 0 <= x < self.width]
+        ys = [y for y in rows if 0 <= y < self.height]
+        if not xs or not ys:
+            return [white.to_bytes(3, "big") * len(columns) for _ in rows]
+        # only read back the part of the image that is sampled
+        left, top, right, bottom = min(xs), min(ys), max(xs) + 1, max(ys) + 1
+        crop = self.image.crop((left, top, right, bottom))
+        pixels = _Framebuffer(right - left, bottom - top, data=crop.tobytes())
+        return pixels.region_rgb(
+            [x - left if 0 <= x < self.width else -1 for x in columns],
+            [y - top if 0 <= y < self.height else -1 for y in rows],
+        )
+
+    def reset(self, width: int, height: int):
+        """Remove everything from the image and give it a new size.
+        """
+        self.width = width
+        self.height = height
+        self.image = Image.new("RGB", (width, height), "white")
+        self.draw = ImageDraw.Draw(self.image)
+
+    def refresh(self):
+        pass
+
+    def poll(self):
+        pass
+
+    def mainloop(self):
+        pass
+
+    def wait(self, timeout: float | None = None) -> bool:
+        # there are no events without a window
+        return False
+
+    def notify(self):
+        pass
+
+    def save(self, filename: str):
+        self.image.save(filename)
+
+
+def _font_pixels(size: int) -> int:
+    """Private. The size in pixels of a font size in points, as Tk shows it.
+    """
+    # Tk font sizes are in points, at 4 pixels for every 3 points
+    return max(round(size * 4 / 3), 1)
+
+
+@lru_cache(maxsize=64)
+def _image_font(font: str, pixels: int) -> ImageFont.FreeTypeFont:
+    """Private. Load the Pillow font of a family and size in pixels, or the default font.
+    """
+    try:
+        return ImageFont.truetype(font, pixels)
+    except OSError:
+        return ImageFont.load_default(pixels)
+
+
+@lru_cache(maxsize=4096)
+def _text_size(text: str, font: str, pixels: int) -> tuple[int, int]:
+    """Private. The width and height of a text in a Pillow font, one line height per line.
+    """
+    image_font = _image_font(font, pixels)
+    ascent, descent = image_font.getmetrics()
+    lines = text.split("\n")
+    return (
+        math.ceil(max(image_font.getlength(line) for line in lines)),
+        (ascent + descent) * len(lines),
+    )
+
+
+@lru_cache(maxsize=256)
+def _text_mask(
+    text: str, font: str, pixels: int
+) -> tuple[Image.Image | None, int, int]:
+    """Private. Render a text once as a mask, for the text displayed over and over again.
+
+    :return: the mask and the position of its top left corner from where the text is
+        displayed, or None if nothing shows
+    :rtype: tuple[Image.Image | None, int, int]
+    """
+    image_font = _image_font(font, pixels)
+    draw = ImageDraw.Draw(Image.new("L", (1, 1)))
+    left, top, right, bottom = draw.textbbox((0, 0), text, font=image_font)
+    if left >= right or top >= bottom:
+        return None, 0, 0
+    mask = Image.new("L", (right - left, bottom - top), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=image_font)
+    return mask, left, top
+
+
+# Names of the backends that can be passed to turtle_canvas or set in TURTLE_BACKEND
+_backends = {"tk": _TkBackend, "pillow": _PillowBackend}
+
+# Operations recorded in the display list, _NONE marks an operation that was covered
+(
+    _LINE,
+    _OVAL,
+    _PIXEL,
+    _RECTANGLE,
+    _POLYGON,
+    _TEXT,
+    _CLEAR,
+    _BLIT,
+    _FILL,
+    _SEGMENTS,
+) = range(10)
+_NONE = 255
+
+
+class _History:
+    """Private. The last positions of the turtle, kept in a ring buffer of two arrays.
+
+    Once the buffer holds ``capacity`` positions every new one replaces the oldest, so the
+    memory used stays the same however long a program runs.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        """
+        :param capacity: the most positions kept (Default: 65536)
+        :type capacity: int
+        """
+        if capacity < 1:
+            raise ValueError("the history must keep at least one position")
+        self.capacity = capacity
+        self.xs = array("d")
+        self.ys = array("d")
+        # index of the oldest position, 0 until the buffer is full
+        self.start = 0
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def append(self, x: float, y: float):
+        size = len(self.xs)
+        if self.length < size:
+            # reuse the room left by forget()
+            i = (self.start + self.length) % size
+            self.xs[i] = x
+            self.ys[i] = y
+            self.length += 1
+        elif size < self.capacity:
+            self.xs.append(x)
+            self.ys.append(y)
+            self.length += 1
+        else:
+            self.xs[self.start] = x
+            self.ys[self.start] = y
+            self.start = (self.start + 1) % size
+
+    def extend(self, xs: list[float], ys: list[float]):
+        """Append many positions.
+        """
+        if len(xs) * 4 < self.length:
+            for x, y in zip(xs, ys):
+                self.append(x, y)
+            return
+        # cheaper to rebuild the buffer in order, keeping the newest positions that fit
+        old_xs, old_ys = self.last(self.length)
+        self.xs = (old_xs + array("d", xs))[-self.capacity :]
+        self.ys = (old_ys + array("d", ys))[-self.capacity :]
+        self.start = 0
+        self.length = len(self.xs)
+
+    def forget(self, n: int):
+        """Forget the last n positions.
+        """
+        if n > self.length:
+            raise IndexError(f"cannot forget {n} positions, the history has {self.length}")
+        self.length -= max(n, 0)
+
+    def last(self, n: int) -> tuple[array, array]:
+        """Return the x and y coordinates of the last n positions, oldest first.
+
+        n works like a slice, ``history.last(n)`` holds the positions ``list[-n:]`` would.
+        """
+        positions = range(self.length)[-n:]
+        first = (self.start + positions.start) % max(len(self.xs), 1)
+        end = first + len(positions)
+        if end <= len(self.xs):
+            return self.xs[first:end], self.ys[first:end]
+        end -= len(self.xs)
+        return self.xs[first:] + self.xs[:end], self.ys[first:] + self.ys[:end]
+
+    def coords(self, n: int, origin_x: float = 0, origin_y: float = 0) -> array:
+        """Return the last n positions relative to the origin as a flat array of x and y.
+        """
+        xs, ys = self.last(n)
+        if origin_x or origin_y:
+            xs = array("d", [x - origin_x for x in xs])
+            ys = array("d", [y - origin_y for y in ys])
+        coords = array("f", bytes(8 * len(xs)))
+        coords[0::2] = array("f", xs)
+        coords[1::2] = array("f", ys)
+        return coords
+
+    def resize(self, capacity: int):
+        """Change the capacity, keeping the most recent positions that fit.
+        """
+        if capacity < 1:
+            raise ValueError("the history must keep at least one position")
+        self.xs, self.ys = self.last(min(self.length, capacity))
+        self.start = 0
+        self.length = len(self.xs)
+        self.capacity = capacity
+
+
+class _DisplayList:
+    """Private. A compact record of everything drawn on the canvas, kept as parallel arrays.
+
+    Coordinates are stored relative to the origin but before the resolution is applied,
+    so the drawing can be replayed at any resolution, size or on any backend. A line
+    takes 29 bytes. Text and blocks of pixels keep their data in ``extras``.
+
+    Setting a pixel, or a block of pixels of the same size, again hides the previous
+    setting completely, so that one is dropped and programs redrawing the same pixels
+    keep a list bounded by the number of pixels. The pixels with whole coordinates
+    inside the resolution are looked up in a grid of 4 bytes per pixel.
+    """
+
+    def __init__(self, columns: int = 0, rows: int = 0):
+        """
+        :param columns: the width of the grid of pixels, the resolution across
+        :type columns: int
+        :param rows: the height of the grid of pixels, the resolution down
+        :type rows: int
+        """
+        self.columns = columns
+        self.rows = rows
+        self.clear()
+
+    def clear(self):
+        """Forget every operation.
+        """
+        self.ops = array("B")
+        self.starts = array("I")
+        self.coords = array("f")
+        self.colours = array("I")
+        self.widths = array("f")
+        self.extras: dict[int, tuple] = {}
+        # index + 1 of the operation that last set each pixel of the grid, 0 for none,
+        # made when the first one is set
+        self.grid = array("I")
+        # index of the operation that last set any other pixel or block of pixels
+        self.cells: dict[tuple[float, ...], int] = {}
+        self.dropped = 0
+
+    def resize_grid(self, columns: int, rows: int):
+        """Change the size of the grid of pixels, after a change of resolution.
+        """
+        placed = [
+            (i % self.columns, i // self.columns, index - 1)
+            for i, index in enumerate(self.grid)
+            if index
+        ]
+        self.columns, self.rows = columns, rows
+        self.grid = array("I")
+        cells = self.cells
+        self.cells = {}
+        for cell, index in cells.items():
+            if len(cell) == 2:
+                placed.append((*cell, index))
+            else:
+                self.cells[cell] = index
+        for x, y, index in placed:
+            self._cover(_PIXEL, (x, y), None, index)
+
+    def _cover(
+        self, op: int, coords: tuple[float, ...], extra: tuple | None, index: int
+    ) -> int:
+        """Note that an operation sets a pixel or block of pixels.
+
+        :return: the index of the operation that set the same pixels before, or -1
+        :rtype: int
+        """
+        if op == _PIXEL:
+            x, y = coords
+            if 0 <= x < self.columns and 0 <= y < self.rows and x % 1 == y % 1 == 0:
+                if not self.grid:
+                    self.grid = array("I", [0]) * (self.columns * self.rows)
+                cell = int(y) * self.columns + int(x)
+                covered = self.grid[cell] - 1
+                self.grid[cell] = index + 1
+                return covered
+        # keyed as stored, so compacting finds the same pixels
+        cell = tuple(array("f", coords))
+        if op == _BLIT:
+            cell += extra[1:]
+        covered = self.cells.get(cell, -1)
+        self.cells[cell] = index
+        return covered
+
+    def append(
+        self,
+        op: int,
+        coords: tuple[float, ...],
+        colour: int,
+        width: float = 0,
+        extra: tuple | None = None,
+    ):
+        """Record an operation.
+
+        :param op: the operation, one of the ``_LINE`` to ``_SEGMENTS`` codes
+        :type op: int
+        :param coords: the coordinates the operation needs, relative to the origin
+        :type coords: tuple[float, ...]
+        :param colour: colour as an rgb integer
+        :type colour: int
+        :param width: line width in turtle units
+        :type width: float
+        :param extra: anything else the operation needs, such as text and its font
+        :type extra: tuple, optional
+        """
+        if op == _PIXEL or op == _BLIT:
+            covered = self._cover(op, coords, extra, len(self.ops))
+            if covered >= 0:
+                self.ops[covered] = _NONE
+                self.extras.pop(covered, None)
+                self.dropped += 1
+        if extra is not None:
+            self.extras[len(self.ops)] = extra
+        self.ops.append(op)
+        self.starts.append(len(self.coords))
+        self.coords.extend(coords)
+        self.colours.append(colour)
+        self.widths.append(width)
+        if self.dropped > 1024 and self.dropped * 4 > len(self.ops) * 3:
+            self.compact()
+
+    def extend_last(self, coords: tuple[float, ...]):
+        """Add coordinates to the last operation, continuing a line.
+        """
+        self.coords.extend(coords)
+
+    def compact(self):
+        """Remove the operations that were covered.
+        """
+        keep = [i for i, op in enumerate(self.ops) if op != _NONE]
+        ends = self.starts[1:] + array("I", [len(self.coords)])
+        coords = array("f")
+        starts = array("I")
+        for i in keep:
+            starts.append(len(coords))
+            coords += self.coords[self.starts[i] : ends[i]]
+        self.extras = {
+            new: self.extras[old] for new, old in enumerate(keep) if old in self.extras
+        }
+        # index + 1 of every operation kept by its old index + 1, 0 for those dropped
+        renumber = array("I", [0]) * (len(self.ops) + 1)
+        for new, old in enumerate(keep):
+            renumber[old + 1] = new + 1
+        self.grid = array("I", map(renumber.__getitem__, self.grid))
+        self.cells = {cell: renumber[i + 1] - 1 for cell, i in self.cells.items()}
+        self.ops = array("B", [self.ops[i] for i in keep])
+        self.colours = array("I", [self.colours[i] for i in keep])
+        self.widths = array("f", [self.widths[i] for i in keep])
+        self.starts, self.coords = starts, coords
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def __iter__(self):
+        """Yield every operation as (op, coords, colour, width, extra), in drawing order.
+        """
+        ends = self.starts[1:] + array("I", [len(self.coords)])
+        for i, (op, start, end, colour, width) in enumerate(
+            zip(self.ops, self.starts, ends, self.colours, self.widths)
+        ):
+            yield op, self.coords[start:end], colour, width, self.extras.get(i)
 
 
 class TurtleCanvas:
-    """Class with mostly static member describing the turtle and the canvas.
-    """
-    # Turtle vars
-    _direction: int = 0
-    _angles: int = 360
-    _x: int = 0
-    _y: int = 0
-    _thick: int = 1
-    _colour: str = "white"
-    _history: list[tuple[int, int]] = []
-    _old_turtle = []
-    # Canvas vars
-    _root: Tk | None = None
-    _canvas: Canvas | None = None
-    _home: tuple[int, int] = 0, 0
-    _origin_x: int = 0
-    _origin_y: int = 0
-    _pen: bool = True
-    _update: bool = True
-    _x_multiplier: float = 1
-    _y_multiplier: float = 1
-    _width: int = 0
-    _height: int = 0
-    # Input vars
-    _key_code: int = 0
-    _key_sym: str = ""
-    _kshift: int = 128
-    # Possible values: +kshift, -kshift (pressed and released respectively)
-    _pressed_keys: dict[str, int] = {}
-    _mousex: int = -1
-    _mousey: int = -1
+    """A canvas and its turtle.
+
+    Every canvas keeps its own state, so several of them, such as off screen ones, can be
+    used at the same time from different threads or asyncio tasks. The drawing functions
+    of the module act on the current canvas, see current_canvas().
+    """
+
+    def __init__(self):
+        """
+        Make a canvas with the default state of the turtle, without opening it yet.
+        """
+        # Turtle vars
+        self._direction: int = 0
+        self._angles: int = 360
+        self._x: int = 0
+        self._y: int = 0
+        self._thick: int = 1
+        self._colour: int = white
+        self._history: _History = _History()
+        self._old_turtle = []
+        # Canvas vars
+        self._root: tkinter.Tk | None = None
+        self._canvas: tkinter.Canvas | None = None
+        self._home: tuple[int, int] = 0, 0
+        self._origin_x: int = 0
+        self._origin_y: int = 0
+        self._pen: bool = True
+        self._update: bool = True
+        # Refreshes per second while updating, 0 refreshes after every drawing
+        self._frame_rate: int = 60
+        self._last_refresh: float = 0
+        self._x_multiplier: float = 1
+        self._y_multiplier: float = 1
+        self._width: int = 0
+        self._height: int = 0
+        self._backend: _TkBackend | _PillowBackend | None = None
+        self._display_list: _DisplayList = _DisplayList()
+        # (display list index, id, colour, thickness, end x, end y) of the last line drawn
+        self._open_line: tuple | None = None
+        # Input vars
+        self._key_code: int = 0
+        self._key_sym: str = ""
+        self._kshift: int = 128
+        # Possible values: +kshift, -kshift (pressed and released respectively)
+        self._pressed_keys: dict[str, int] = {}
+        self._mousex: int = -1
+        self._mousey: int = -1
+        # The keys wait_for() is waiting for, or None
+        self._waiting: tuple[str, ...] | None = None
+        # Set on every key press, to wake up adetect()
+        self._wakeups: set[asyncio.Event] = set()
+        # The asyncio task handling the events of the window
+        self._pump: asyncio.Task | None = None
+        # Counters of the primitives called, while record_stats() is on
+        self._stats: _Stats | None = None
 
     def create(
         self,
@@ -53,6 +1749,8 @@ class TurtleCanvas:
         origin_y: int = 0,
         width: int = 500,
         height: int = 500,
+        raster: bool = False,
+        backend: str | None = None,
     ):
         """
         Create a new canvas with a new Turtle.
@@ -65,48 +1763,110 @@ class TurtleCanvas:
         :type width: int
         :param height: the height of the canvas (Default: 500)
         :type height: int
+        :param raster: draw everything in a single image instead of canvas items (Default: False)
+        :type raster: bool
+        :param backend: "tk" to draw in a window or "pillow" to draw off screen (Default: the
+            TURTLE_BACKEND environment variable, or "tk")
+        :type backend: str, optional
         """
-        TurtleCanvas._width = width
-        TurtleCanvas._height = height
-        TurtleCanvas._root = Tk()
-        TurtleCanvas._root.title("Turtle")
-
-        self._frame = Frame(
-            self._root, width=TurtleCanvas._width, height=TurtleCanvas._height + 100
-        )
-        self._frame.pack(expand=True, fill=BOTH)
-        self._halt = Button(self._frame, text="HALT")
-        self._halt.pack()
-
-        TurtleCanvas._canvas = Canvas(
-            self._frame, bg="white", width=width, height=height
-        )
-        TurtleCanvas._canvas.pack(side="bottom")
-        TurtleCanvas._canvas.focus_set()
-        TurtleCanvas._canvas.bind("<KeyPress>", on_press)
-        TurtleCanvas._canvas.bind("<KeyRelease>", on_release)
-        TurtleCanvas._canvas.bind("<ButtonPress>", on_press)
-        TurtleCanvas._canvas.bind("<ButtonRelease>", on_release)
-
-        self._halt.bind("<ButtonRelease>", halt)
-
-        TurtleCanvas._origin_x, TurtleCanvas._origin_y = origin_x, origin_y
-        TurtleCanvas._home = width / 2, height / 2
-        TurtleCanvas._x, TurtleCanvas._y = TurtleCanvas._home
+        name = backend or os.environ.get("TURTLE_BACKEND", "tk")
+        if name not in _backends:
+            raise ValueError(
+                f"Unknown backend {name!r}, expected one of {', '.join(_backends)}"
+            )
+        self._width = width
+        self._height = height
+        self._backend = _backends[name](width, height, raster)
+        self._root = getattr(self._backend, "root", None)
+        self._canvas = getattr(self._backend, "canvas", None)
+        self._display_list = _DisplayList(width, height)
+        self._open_line = None
+
+        self._origin_x, self._origin_y = origin_x, origin_y
+        self._home = width / 2, height / 2
+        self._x, self._y = self._home
         # TurtleCanvas._history.append(TurtleCanvas._home)
+        if self._canvas is not None:
+            # key presses go to this canvas, whichever canvas is current
+            for sequence, handler in (
+                ("<KeyPress>", on_press),
+                ("<KeyRelease>", on_release),
+                ("<ButtonPress>", on_press),
+                ("<ButtonRelease>", on_release),
+            ):
+                self._canvas.bind(sequence, partial(handler, canvas=self))
+        self.make_current()
+
+    def make_current(self):
+        """
+        Make the drawing functions act on this canvas, in the current thread or asyncio task.
+
+        Threads and tasks that never made a canvas current use the canvas created last.
+        """
+        global _last_canvas
+        _current_canvas.set(self)
+        _last_canvas = self
 
-    def refresh():
+    def refresh(self):
         """
         Refresh the canvas to display the latest drawings.
         """
-        if not TurtleCanvas._canvas:
+        if not self._backend:
             logging.error("Canvas not lanuched, please create a canvas first.")
-        TurtleCanvas._root.update()
+        if self._stats is not None:
+            start = perf_counter()
+            self._backend.refresh()
+            self._stats.refreshes += 1
+            self._stats.refresh_time += perf_counter() - start
+        else:
+            self._backend.refresh()
+        self._last_refresh = perf_counter()
+
+    def refresh_soon(self):
+        """
+        Refresh the canvas unless it was refreshed less than a frame ago, so drawings made in
+        quick succession are shown together at most frame_rate times a second.
+        """
+        if (
+            not self._frame_rate
+            or perf_counter() - self._last_refresh >= 1 / self._frame_rate
+        ):
+            self.refresh()
+
+
+# The canvas the drawing functions act on, set separately in each thread and asyncio task
+_current_canvas: ContextVar[TurtleCanvas | None] = ContextVar("current_canvas", default=None)
+# Used where no canvas was made current, so programs with one canvas work from any thread
+_last_canvas: TurtleCanvas = TurtleCanvas()
+
+
+def _current() -> TurtleCanvas:
+    """Private. The canvas the drawing functions act on.
+    """
+    return _current_canvas.get() or _last_canvas
+
+
+def current_canvas() -> TurtleCanvas:
+    """Get the canvas the drawing functions act on.
+
+    Creating a canvas makes it current in the thread or asyncio task that created it, and
+    canvas.make_current() switches to another one, so independent canvases can be drawn on
+    at the same time.
+
+    :return: the current canvas
+    :rtype: TurtleCanvas
+    """
+    return _current()
 
 
 @contextmanager
 def turtle_canvas(
-    origin_x: int = 0, origin_y: int = 0, width: int = 500, height: int = 500
+    origin_x: int = 0,
+    origin_y: int = 0,
+    width: int = 500,
+    height: int = 500,
+    raster: bool = False,
+    backend: str | None = None,
 ):
     """
     Context manager that creates a canvas at the start and halts at the end.
@@ -119,49 +1879,227 @@ def turtle_canvas(
     :type width: int
     :param height: the height of the canvas (Default: 500)
     :type height: int
+    :param raster: draw everything in a single image instead of canvas items,
+        for programs that set a lot of pixels or animate for a long time, since
+        canvas items only go once something opaque is drawn over them (Default: False)
+    :type raster: bool
+    :param backend: "tk" to draw in a window or "pillow" to draw off screen, without a
+        window, for example on a server (Default: the TURTLE_BACKEND environment variable,
+        or "tk"). When the TURTLE_OUTPUT environment variable is set, the final drawing is
+        saved to that file.
+    :type backend: str, optional
     """
     canvas = TurtleCanvas()
     try:
-        canvas.create(origin_x, origin_y, width, height)
+        canvas.create(origin_x, origin_y, width, height, raster, backend)
         yield canvas
-    except TclError:
+    except _window_closed():
         logging.debug("Window closed")
     finally:
-        TurtleCanvas._canvas.mainloop()
+        if canvas._backend:
+            if os.environ.get("TURTLE_OUTPUT"):
+                canvas.make_current()
+                save(os.environ["TURTLE_OUTPUT"])
+            canvas._backend.mainloop()
+
+
+@asynccontextmanager
+async def aturtle_canvas(
+    origin_x: int = 0,
+    origin_y: int = 0,
+    width: int = 500,
+    height: int = 500,
+    raster: bool = False,
+    backend: str | None = None,
+):
+    """
+    Asynchronous context manager that creates a canvas at the start and waits for the
+    window to be closed at the end, for programs running other asyncio tasks alongside.
+
+    The window is handled from an asyncio task, so use apause() and adetect() instead of
+    pause() and detect(), which block every task. The parameters are the same as for
+    turtle_canvas().
+    """
+    canvas = TurtleCanvas()
+    try:
+        canvas.create(origin_x, origin_y, width, height, raster, backend)
+        _start_pump(canvas)
+        yield canvas
+    except _window_closed():
+        logging.debug("Window closed")
+    finally:
+        if canvas._backend:
+            if os.environ.get("TURTLE_OUTPUT"):
+                canvas.make_current()
+                save(os.environ["TURTLE_OUTPUT"])
+            if canvas._pump:
+                await canvas._pump
+
+
+def save(filename: str, width: int | None = None, height: int | None = None):
+    """Save the drawing on the canvas to an image file, in any format Pillow supports.
+
+    The drawing is redrawn off screen, so it can be saved at any size whichever backend
+    the canvas uses.
+
+    :param filename: name of the file, its extension decides the format
+    :type filename: str
+    :param width: width of the image (Default: the width of the canvas)
+    :type width: int, optional
+    :param height: height of the image (Default: the height of the canvas)
+    :type height: int, optional
+    """
+    canvas = _current()
+    width = width or canvas._width
+    height = height or canvas._height
+    if (
+        isinstance(canvas._backend, _PillowBackend)
+        and (width, height) == (canvas._width, canvas._height)
+    ):
+        canvas._backend.save(filename)
+        return
+    backend = _PillowBackend(width, height)
+    _replay(
+        backend,
+        canvas._x_multiplier * width / canvas._width,
+        canvas._y_multiplier * height / canvas._height,
+    )
+    backend.save(filename)
 
 
 def update():
     """
     Update the Canvas, and continue updating with all subsequent drawing commands.
     """
-    TurtleCanvas._update = True
-    TurtleCanvas.refresh()
+    canvas = _current()
+    canvas._update = True
+    canvas.refresh()
 
 
 def noupdate():
     """
     Refrain from updating the Canvas when executing all subsequent drawing commands, until update() is called.
     """
-    TurtleCanvas._update = False
+    _current()._update = False
+
+
+def frame_rate(fps: int):
+    """Set how many times a second the canvas is updated at most while drawing.
+
+    Drawings made in between are shown together in the next update, pause() and detect()
+    always show everything drawn so far.
+
+    :param fps: the number of updates per second, or 0 to update after every drawing (Default: 60)
+    :type fps: int
+    """
+    canvas = _current()
+    canvas._frame_rate = fps
+
+
+def record_stats(on: bool = True):
+    """Start or stop counting the calls, time and items created of every primitive, and
+    the time spent refreshing the canvas, to find out where a slow program spends its time.
+
+    The counts go on from where they were, see reset_stats(). Counting costs nothing while
+    it is off.
+
+    :param on: True to start counting, False to stop (Default: True)
+    :type on: bool
+    """
+    canvas = _current()
+    if not on:
+        canvas._stats = None
+    elif canvas._stats is None:
+        canvas._stats = _Stats()
+
+
+def reset_stats():
+    """Set every count of record_stats() back to 0.
+    """
+    canvas = _current()
+    if canvas._stats is not None:
+        canvas._stats = _Stats()
+
+
+def stats() -> dict:
+    """Get the counts of record_stats() and the size of what the canvas holds now.
+
+    The result has:
+
+    - "primitives": for each primitive called, a dictionary of its "calls", the "time" in
+      seconds and the canvas "items" created, counting the primitives it calls within it,
+      always 0 for the pillow backend like "items"
+    - "refreshes" and "refresh_time": how often the canvas was refreshed, and how long
+      that took in seconds
+    - "items": the number of items on the canvas now, 0 for the pillow backend
+    - "history": the number of positions remembered
+    - "display_list": the number of drawings kept to redraw the canvas
+    - "colour_cache": the "hits" and "misses" of the colours parsed
+    - "uploaded" and "last_upload": the bytes of pixels sent to the window of a raster
+      canvas, in all and by the last refresh
+
+    :return: the counts, with the counters of record_stats() at 0 while counting is off
+    :rtype: dict
+    """
+    canvas = _current()
+    counts = canvas._stats or _Stats()
+    colours = _parse_colour.cache_info()
+    return {
+        "primitives": {
+            name: {"calls": calls, "time": time, "items": items}
+            for name, (calls, time, items) in counts.primitives.items()
+        },
+        "refreshes": counts.refreshes,
+        "refresh_time": counts.refresh_time,
+        "items": canvas._backend.item_count() if canvas._backend else 0,
+        "history": canvas._history.length,
+        "display_list": len(canvas._display_list),
+        "colour_cache": {"hits": colours.hits, "misses": colours.misses},
+        "uploaded": canvas._backend.uploaded if canvas._backend else 0,
+        "last_upload": canvas._backend.last_upload if canvas._backend else 0,
+    }
 
 
 def resolution(x: int, y: int):
     """ Set the resolution of the canvas to x by y
 
+    A raster canvas with a resolution lower than its size keeps only x by y pixels and
+    scales them up when they are shown, so it draws and remembers no more than that.
+
     :param x: resolution on the x axis
     :type x: int
     :param y: resolution on the y axis
     :type y: int
     """
-    TurtleCanvas._x_multiplier = TurtleCanvas._width / x
-    TurtleCanvas._y_multiplier = TurtleCanvas._height / y
-    TurtleCanvas._canvas.scale(
-        "all",
-        0,
-        0,
-        TurtleCanvas._x_multiplier,
-        TurtleCanvas._y_multiplier,
-    )
+    canvas = _current()
+    canvas._x_multiplier = canvas._width / x
+    canvas._y_multiplier = canvas._height / y
+    canvas._backend.set_resolution(canvas._x_multiplier, canvas._y_multiplier)
+    canvas._display_list.resize_grid(x, y)
+    # draw everything again rather than stretching what is on the canvas
+    if len(canvas._display_list):
+        canvas._backend.reset(canvas._width, canvas._height)
+        canvas._open_line = None
+        _replay(canvas._backend)
+
+
+def resize(width: int, height: int):
+    """Change the size of the canvas, keeping its resolution and redrawing everything on it.
+
+    :param width: the new width of the canvas
+    :type width: int
+    :param height: the new height of the canvas
+    :type height: int
+    """
+    canvas = _current()
+    canvas._x_multiplier *= width / canvas._width
+    canvas._y_multiplier *= height / canvas._height
+    canvas._width = width
+    canvas._height = height
+    canvas._backend.reset(width, height)
+    canvas._backend.set_resolution(canvas._x_multiplier, canvas._y_multiplier)
+    canvas._open_line = None
+    _replay(canvas._backend)
 
 
 def move(func: callable) -> callable:
@@ -173,8 +2111,12 @@ def move(func: callable) -> callable:
     :rtype: callable
     """
     def inner(*args, **kwargs):
-        val = func(*args, **kwargs)
-        TurtleCanvas._history.append((TurtleCanvas._x, TurtleCanvas._y))
+        canvas = _current()
+        if canvas._stats is not None:
+            val = _measure(canvas, func, args, kwargs)
+        else:
+            val = func(*args, **kwargs)
+        canvas._history.append(canvas._x, canvas._y)
         return val
 
     return inner
@@ -184,7 +2126,8 @@ def remember():
     """
     Add the current coordinates to the history of the turtle
     """
-    TurtleCanvas._history.append((TurtleCanvas._x, TurtleCanvas._y))
+    canvas = _current()
+    canvas._history.append(canvas._x, canvas._y)
 
 
 def forget(n: int):
@@ -194,8 +2137,19 @@ def forget(n: int):
     :param n: number of positions to forget
     :type n: int
     """
-    for i in range(n):
-        TurtleCanvas._history.pop()
+    _current()._history.forget(n)
+
+
+def history_size(capacity: int):
+    """Set how many positions of the turtle are remembered, 65536 by default.
+
+    Once that many are remembered, each new position replaces the oldest one, so that
+    programs making millions of moves use a fixed amount of memory.
+
+    :param capacity: the number of positions to remember
+    :type capacity: int
+    """
+    _current()._history.resize(capacity)
 
 
 # Change coordinates
@@ -203,7 +2157,8 @@ def home():
     """
     Move the turtle to the center of the canvas
     """
-    setxy(*TurtleCanvas._home)
+    canvas = _current()
+    setxy(*canvas._home)
 
 
 @move
@@ -213,7 +2168,7 @@ def setx(x: int):
     :param x: the new x coordinate of the turtle
     :type x: int
     """
-    TurtleCanvas._x = x
+    _current()._x = x
 
 
 @move
@@ -223,7 +2178,7 @@ def sety(y: int):
     :param y: the new y coordinate of the turtle
     :type y: int
     """
-    TurtleCanvas._y = y
+    _current()._y = y
 
 
 @move
@@ -235,16 +2190,47 @@ def setxy(x: int, y: int):
     :param y: the new y coordinate of the turtle
     :type y: int
     """
-    TurtleCanvas._x = x
-    TurtleCanvas._y = y
+    canvas = _current()
+    canvas._x = x
+    canvas._y = y
 
 
 # Change colour
 
 
+@lru_cache(maxsize=1024)
+def _parse_colour(colour: tuple[int, int, int] | str) -> int:
+    """Private. Convert a named or (r, g, b) colour to an integer, remembering the recent ones.
+    """
+    if isinstance(colour, str):
+        colour = ImageColor.getrgb(colour)
+    r, g, b = colour[:3]
+    return (r << 16) + (g << 8) + b
+
+
+@lru_cache(maxsize=1024)
+def _int_to_str(colour: int) -> str:
+    """Private. Convert an integer colour to a Tk colour string, remembering the recent ones.
+    """
+    return f"#{colour:06x}"
+
+
+# Tk colour strings of the colours in constants.colour_list, which programs use the most
+_colour_strings: dict[int, str] = {colour: f"#{colour:06x}" for colour in colour_list}
+
+
+def _colour_tuple(colour: int) -> tuple[int, int, int]:
+    """Private. Convert an integer colour to the (r, g, b) tuple Pillow draws with.
+    """
+    return colour >> 16, (colour >> 8) & 0xFF, colour & 0xFF
+
+
 def colour_to_int(colour: tuple[int, int, int] | int | str) -> int:
     """Convert the colour parameter from any acceptable format to an integer (from 0 to 255).
 
+    Integers are the colours used inside the module, named and tuple colours are parsed
+    once and then looked up.
+
     :param colour: colour to be converted
     :type colour: tuple[int, int, int] | int | str
     :return: the integer format of the colour
@@ -252,11 +2238,8 @@ def colour_to_int(colour: tuple[int, int, int] | int | str) -> int:
     """
     if isinstance(colour, int):
         return colour
-    elif isinstance(colour, str):
-        return colour_to_int(ImageColor.getrgb(colour))
-    elif isinstance(colour, tuple):
-        r, g, b = colour
-        return (r << 16) + (g << 8) + b
+    elif isinstance(colour, (str, tuple)):
+        return _parse_colour(colour)
 
 
 def colour_to_str(colour: tuple[int, int, int] | int | str) -> str:
@@ -270,11 +2253,10 @@ def colour_to_str(colour: tuple[int, int, int] | int | str) -> str:
     if isinstance(colour, str):
         return colour
     elif isinstance(colour, tuple):
-        r, g, b = colour
-        # hex strings start with 0x so we strip that to create the colour hex
-        return f"#{hex(r)[2:]}{hex(g)[2:]}{hex(b)[2:]}"
-    elif isinstance(colour, int):
-        return f"#{colour.to_bytes(3, 'big').hex()}"
+        colour = _parse_colour(colour)
+    if isinstance(colour, int):
+        string = _colour_strings.get(colour)
+        return string if string is not None else _int_to_str(colour)
 
 
 def colour(new_colour: tuple[int, int, int] | int | str):
@@ -283,7 +2265,7 @@ def colour(new_colour: tuple[int, int, int] | int | str):
     :param new_colour: new colour, as either an (r, g, b) tuple, a rgb hex integer or a string
     :type new_colour: tuple[int, int, int] | int | str
     """
-    TurtleCanvas._colour = colour_to_str(new_colour)
+    _current()._colour = colour_to_int(new_colour)
 
 
 # Change pen
@@ -295,19 +2277,19 @@ def thickness(new_thickness: int):
     :param new_thickness: new thickness of the pen.
     :type new_thickness: int
     """
-    TurtleCanvas._thick = new_thickness
+    _current()._thick = new_thickness
 
 
 def penup():
     """Pick up the pen, stop drawing.
     """
-    TurtleCanvas._pen = False
+    _current()._pen = False
 
 
 def pendown():
     """Put down the pen, all movement functions now produce drawings.
     """
-    TurtleCanvas._pen = True
+    _current()._pen = True
 
 
 def pause(duration: int):
@@ -316,8 +2298,31 @@ def pause(duration: int):
     :param duration: number milliseconds to pause
     :type duration: int
     """
-    sleep(duration / 1000)
-    TurtleCanvas.refresh()
+    canvas = _current()
+    # show what was drawn before waiting, there is nobody watching an off screen canvas
+    canvas.refresh()
+    if not canvas._backend.headless:
+        sleep(duration / 1000)
+        canvas.refresh()
+
+
+async def apause(duration: int):
+    """Pause `duration` milliseconds without blocking other asyncio tasks.
+
+    The window keeps handling events while paused.
+
+    :param duration: number milliseconds to pause
+    :type duration: int
+    """
+    canvas = _current()
+    canvas.refresh()
+    if canvas._backend.headless:
+        # still let the other tasks run
+        await asyncio.sleep(0)
+        return
+    _start_pump(canvas)
+    await asyncio.sleep(duration / 1000)
+    canvas.refresh()
 
 
 # Change direction
@@ -329,9 +2334,8 @@ def right(degrees: int):
     :param degrees: number of degrees to turn right
     :type degrees: int
     """
-    TurtleCanvas._direction = (
-        TurtleCanvas._direction - degrees * 360 / TurtleCanvas._angles
-    ) % 360
+    canvas = _current()
+    canvas._direction = (canvas._direction - degrees * 360 / canvas._angles) % 360
 
 
 def left(degrees: int):
@@ -340,9 +2344,8 @@ def left(degrees: int):
     :param degrees: number of degrees to turn left
     :type degrees: int
     """
-    TurtleCanvas._direction = (
-        TurtleCanvas._direction + degrees * 360 / TurtleCanvas._angles
-    ) % 360
+    canvas = _current()
+    canvas._direction = (canvas._direction + degrees * 360 / canvas._angles) % 360
 
 
 def direction(degrees: int):
@@ -351,7 +2354,8 @@ def direction(degrees: int):
     :param degrees: number of degrees that indicate a direction to face
     :type degrees: int
     """
-    TurtleCanvas._direction = 360 / TurtleCanvas._angles * degrees
+    canvas = _current()
+    canvas._direction = 360 / canvas._angles * degrees
 
 
 # There is little actual support for the custom angles
@@ -361,7 +2365,7 @@ def angles(degrees: int):
     :param degrees: number of degrees in a circle 
     :type degrees: int
     """
-    TurtleCanvas._angles = degrees
+    _current()._angles = degrees
 
 
 def turnxy(x: int, y: int):
@@ -372,8 +2376,9 @@ def turnxy(x: int, y: int):
     :param y: the y coordinate of the point to face
     :type y: int
     """
+    canvas = _current()
     # if y/x = tan t, then t = arctan(y/x)
-    TurtleCanvas._direction = math.degrees(math.atan(y / x))
+    canvas._direction = math.degrees(math.atan(y / x))
 
 
 # Draw shapes
@@ -388,15 +2393,227 @@ def draw(func: callable) -> callable:
     :rtype: callable
     """
     def inner(*args, **kwargs) -> int:
-        id: int = func(*args, **kwargs)
-        if TurtleCanvas._update:
-            TurtleCanvas.refresh()
-        TurtleCanvas._canvas.focus_set()
+        canvas = _current()
+        if canvas._stats is not None:
+            id: int = _measure(canvas, func, args, kwargs)
+        else:
+            id = func(*args, **kwargs)
+        if canvas._update:
+            canvas.refresh_soon()
         return id
 
     return inner
 
 
+def counted(func: callable) -> callable:
+    """Private. A decorator counting the calls of a primitive that neither draws nor moves
+    by itself, while record_stats() is on.
+
+    :param func: the primitive
+    :type func: callable
+    :return: the primitive, counted
+    :rtype: callable
+    """
+    @wraps(func)
+    def inner(*args, **kwargs):
+        canvas = _current()
+        if canvas._stats is not None:
+            return _measure(canvas, func, args, kwargs)
+        return func(*args, **kwargs)
+
+    return inner
+
+
+class _Stats:
+    """Private. The calls, time and items created of every primitive, see record_stats().
+    """
+
+    def __init__(self):
+        # name: [calls, seconds, items created]
+        self.primitives: dict[str, list] = {}
+        self.refreshes = 0
+        self.refresh_time = 0.0
+        # set while a primitive runs, so the ones it calls are not counted again
+        self.busy = False
+
+
+def _measure(canvas: TurtleCanvas, func: callable, args: tuple, kwargs: dict):
+    """Private. Call a primitive, adding it to the counters unless called by another one.
+    """
+    stats = canvas._stats
+    if stats.busy:
+        return func(*args, **kwargs)
+    stats.busy = True
+    backend = canvas._backend
+    created = backend.created if backend else 0
+    start = perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        elapsed = perf_counter() - start
+        stats.busy = False
+        counters = stats.primitives.setdefault(func.__name__.lstrip("_"), [0, 0.0, 0])
+        counters[0] += 1
+        counters[1] += elapsed
+        if backend:
+            counters[2] += backend.created - created
+
+
+def _scale(
+    coords: tuple[float, ...], x_multiplier: float, y_multiplier: float
+) -> tuple[float, ...]:
+    """Private. Apply the resolution to a flat list of x and y coordinates.
+    """
+    if x_multiplier == 1 and y_multiplier == 1:
+        return coords
+    return tuple(
+        c * (y_multiplier if i % 2 else x_multiplier) for i, c in enumerate(coords)
+    )
+
+
+def _render(
+    backend: _TkBackend | _PillowBackend,
+    op: int,
+    coords: tuple[float, ...],
+    colour: int,
+    width: float,
+    extra: tuple | None,
+    x_multiplier: float,
+    y_multiplier: float,
+) -> int:
+    """Private. Draw one operation of the display list on a backend at a given resolution.
+
+    :return: id of the shape drawn
+    :rtype: int
+    """
+    if op == _LINE:
+        return backend.line(
+            _scale(coords, x_multiplier, y_multiplier), colour, width * x_multiplier
+        )
+    elif op == _OVAL:
+        x1, y1, x2, y2 = coords
+        return backend.oval(
+            x1 * x_multiplier,
+            y1 * y_multiplier,
+            x2 * x_multiplier,
+            y2 * y_multiplier,
+            colour,
+            width * x_multiplier,
+        )
+    elif op == _PIXEL:
+        x, y = coords
+        return backend.pixel(
+            x * x_multiplier,
+            y * y_multiplier,
+            (x + 1) * x_multiplier,
+            (y + 1) * y_multiplier,
+            colour,
+        )
+    elif op == _RECTANGLE:
+        # the border is as thick as the pen whatever the resolution
+        x1, y1, x2, y2 = coords
+        return backend.rectangle(
+            x1 * x_multiplier,
+            y1 * y_multiplier,
+            x2 * x_multiplier,
+            y2 * y_multiplier,
+            colour,
+            width,
+        )
+    elif op == _POLYGON:
+        return backend.polygon(
+            [
+                (coords[i] * x_multiplier, coords[i + 1] * y_multiplier)
+                for i in range(0, len(coords), 2)
+            ],
+            colour,
+        )
+    elif op == _TEXT:
+        x, y = coords
+        text, font, size = extra
+        return backend.text(x * x_multiplier, y * y_multiplier, text, font, size, colour)
+    elif op == _CLEAR:
+        return backend.clear(colour)
+    elif op == _BLIT:
+        x, y = coords
+        rgb, w, h = extra
+        return backend.blit(
+            x * x_multiplier, y * y_multiplier, rgb, w, h, x_multiplier, y_multiplier
+        )
+    elif op == _FILL:
+        # the coordinates are (y, first x, end x) of each span of pixels filled
+        return backend.fill_rects(
+            [
+                (
+                    coords[i + 1] * x_multiplier,
+                    coords[i] * y_multiplier,
+                    coords[i + 2] * x_multiplier,
+                    (coords[i] + 1) * y_multiplier,
+                )
+                for i in range(0, len(coords), 3)
+            ],
+            colour,
+        )
+    elif op == _SEGMENTS:
+        # each line has its own colour
+        return backend.segments(
+            _scale(coords, x_multiplier, y_multiplier),
+            array("I", extra[0]),
+            width * x_multiplier,
+        )
+
+
+def _emit(
+    op: int,
+    coords: tuple[float, ...],
+    colour: int,
+    width: float = 0,
+    extra: tuple | None = None,
+) -> int:
+    """Private. Record an operation in the display list and draw it on the canvas.
+
+    :return: id of the shape drawn
+    :rtype: int
+    """
+    canvas = _current()
+    if op == _CLEAR:
+        # nothing drawn before can be seen any more
+        canvas._display_list.clear()
+    # a line drawn after anything else starts a new shape, and appending may compact
+    # the display list, which renumbers its operations
+    canvas._open_line = None
+    canvas._display_list.append(op, coords, colour, width, extra)
+    return _render(
+        canvas._backend,
+        op,
+        coords,
+        colour,
+        width,
+        extra,
+        canvas._x_multiplier,
+        canvas._y_multiplier,
+    )
+
+
+def _replay(
+    backend: _TkBackend | _PillowBackend,
+    x_multiplier: float | None = None,
+    y_multiplier: float | None = None,
+):
+    """Private. Draw the whole display list on a backend, by default at the current resolution.
+    """
+    canvas = _current()
+    if x_multiplier is None:
+        x_multiplier = canvas._x_multiplier
+    if y_multiplier is None:
+        y_multiplier = canvas._y_multiplier
+    for op, coords, colour, width, extra in canvas._display_list:
+        if op == _NONE:
+            continue
+        _render(backend, op, coords, colour, width, extra, x_multiplier, y_multiplier)
+
+
+@counted
 def forward(distance: int) -> int:
     """Move forward.
     :param distance: distance to travel forward.
@@ -404,12 +2621,14 @@ def forward(distance: int) -> int:
     :return: id of the shape drawn, if the pen is down, else -1.
     :rtype: int
     """
+    canvas = _current()
     return movexy(
-        -distance * math.sin(math.radians(TurtleCanvas._direction)),
-        -distance * math.cos(math.radians(TurtleCanvas._direction)),
+        -distance * math.sin(math.radians(canvas._direction)),
+        -distance * math.cos(math.radians(canvas._direction)),
     )
 
 
+@counted
 def back(distance: int) -> int:
     """Move back.
     :param distance: distance to travel back.
@@ -431,47 +2650,225 @@ def movexy(x: int, y: int) -> int:
     :return: id of the shape drawn, if the pen is down, else -1
     :rtype: int
     """
-    new_x = TurtleCanvas._x + x
-    new_y = TurtleCanvas._y + y
-    if TurtleCanvas._pen:
-        id = _draw_line(TurtleCanvas._x, TurtleCanvas._y, new_x, new_y)
+    canvas = _current()
+    new_x = canvas._x + x
+    new_y = canvas._y + y
+    if canvas._pen:
+        id = _draw_line(canvas._x, canvas._y, new_x, new_y)
     else:
         id = -1
-    TurtleCanvas._x = new_x
-    TurtleCanvas._y = new_y
+    canvas._x = new_x
+    canvas._y = new_y
     return id
 
 
-@move
-def drawxy(x: int, y: int) -> int:
-    """Move to point (x, y), drawing a line regadless of the pen position.
-    :param x: x coordinate of the destination point
-    :type x: int
-    :param y: y coordinate of the destination point
-    :type y: int
-    :return: id of the shape drawn
-    :rtype: int
-    """
-    new_x = TurtleCanvas._x + x
-    new_y = TurtleCanvas._y + y
-    id = _draw_line(TurtleCanvas._x, TurtleCanvas._y, new_x, new_y)
-    TurtleCanvas._x = new_x
-    TurtleCanvas._y = new_y
-    return id
+@move
+def drawxy(x: int, y: int) -> int:
+    """Move to point (x, y), drawing a line regadless of the pen position.
+    :param x: x coordinate of the destination point
+    :type x: int
+    :param y: y coordinate of the destination point
+    :type y: int
+    :return: id of the shape drawn
+    :rtype: int
+    """
+    canvas = _current()
+    new_x = canvas._x + x
+    new_y = canvas._y + y
+    id = _draw_line(canvas._x, canvas._y, new_x, new_y)
+    canvas._x = new_x
+    canvas._y = new_y
+    return id
+
+
+def _draw_line(x: int, y: int, new_x: int, new_y: int):
+    """Private. Helper class used to draw a line between two points.
+    """
+    canvas = _current()
+    return _draw_path(
+        (
+            x - canvas._origin_x,
+            y - canvas._origin_y,
+            new_x - canvas._origin_x,
+            new_y - canvas._origin_y,
+        )
+    )
+
+
+# points an open line takes before lines carrying on from it start a new one, Tk copies
+# all the points of a line item to add any
+_LINE_POINTS = 4096
+
+
+@draw
+def _draw_path(coords: tuple[float, ...]) -> int:
+    """Private. Draw lines through the points of a flat list of coordinates relative to the origin.
+
+    A line carrying on from where the last drawing, a line of the same colour and
+    thickness, ended is added to it, so that a path becomes a single shape of up to
+    _LINE_POINTS points.
+    """
+    canvas = _current()
+    colour = canvas._colour
+    line = (colour, canvas._thick, coords[0], coords[1])
+    display_list = canvas._display_list
+    if (
+        canvas._open_line
+        and canvas._open_line[0] == len(display_list) - 1
+        and canvas._open_line[2:] == line
+        and len(display_list.coords) - display_list.starts[-1] < 2 * _LINE_POINTS
+    ):
+        id = canvas._open_line[1]
+        display_list.extend_last(coords[2:])
+        canvas._backend.extend_line(
+            id,
+            _scale(coords, canvas._x_multiplier, canvas._y_multiplier),
+            colour,
+            canvas._thick * canvas._x_multiplier,
+        )
+    else:
+        id = _emit(_LINE, coords, colour, canvas._thick)
+    canvas._open_line = (
+        len(display_list) - 1,
+        id,
+        colour,
+        canvas._thick,
+        coords[-2],
+        coords[-1],
+    )
+    return id
+
+
+# Moves understood by run_moves, with the sign they move or turn by
+_MOVES = {"fd": 1, "forward": 1, "bk": -1, "back": -1}
+_TURNS = {"lt": 1, "left": 1, "rt": -1, "right": -1}
+
+
+@lru_cache(maxsize=8)
+def _trig_table(units: int) -> tuple[list[float], list[float]]:
+    """Private. The sines and cosines of every whole direction when a circle has `units` units.
+    """
+    return (
+        [math.sin(2 * math.pi * i / units) for i in range(units)],
+        [math.cos(2 * math.pi * i / units) for i in range(units)],
+    )
+
+
+@counted
+def run_moves(moves) -> int:
+    """Run a sequence of moves and turns in one go, drawing the whole path as a single line.
+
+    This does the same as calling forward(), back(), left() and right() one by one, but
+    works out all the positions together, using a table of sines and cosines when every
+    direction is a whole number of the units set by angles().
+
+    :param moves: (move, amount) pairs, where the move is "fd" or "forward", "bk" or
+        "back", "lt" or "left", "rt" or "right"
+    :type moves: list[tuple[str, int]]
+    :return: id of the line drawn, or -1 if the pen is up or the turtle did not move
+    :rtype: int
+    """
+    canvas = _current()
+    units = canvas._angles
+    heading = canvas._direction * units / 360
+    if heading.is_integer():
+        heading = int(heading)
+    headings = []
+    distances = []
+    for move, amount in moves:
+        if move in _TURNS:
+            heading += _TURNS[move] * amount
+        elif move in _MOVES:
+            headings.append(heading)
+            distances.append(_MOVES[move] * amount)
+        else:
+            raise ValueError(f"unknown move {move!r}")
+    canvas._direction = (heading * 360 / units) % 360
+    if not distances:
+        return -1
+    if isinstance(units, int) and all(isinstance(h, int) for h in headings):
+        sines, cosines = _trig_table(units)
+        steps_x = [-d * sines[h % units] for d, h in zip(distances, headings)]
+        steps_y = [-d * cosines[h % units] for d, h in zip(distances, headings)]
+    else:
+        scale = 2 * math.pi / units
+        steps_x = [-d * math.sin(h * scale) for d, h in zip(distances, headings)]
+        steps_y = [-d * math.cos(h * scale) for d, h in zip(distances, headings)]
+    xs = list(accumulate(steps_x, initial=canvas._x))
+    ys = list(accumulate(steps_y, initial=canvas._y))
+    canvas._x, canvas._y = xs[-1], ys[-1]
+    # every move is remembered, as if made by forward()
+    canvas._history.extend(xs[1:], ys[1:])
+    if not canvas._pen:
+        return -1
+    coords = [0.0] * (2 * len(xs))
+    coords[0::2] = [x - canvas._origin_x for x in xs]
+    coords[1::2] = [y - canvas._origin_y for y in ys]
+    return _draw_path(coords)
+
+
+class Path:
+    """A sequence of moves and turns, built up one at a time and drawn in one go.
+
+    ``path().fd(100).rt(90).fd(100).draw()`` draws the same as the forward() and right()
+    calls, as a single line. See run_moves().
+    """
+
+    def __init__(self, moves=None):
+        """
+        :param moves: the (move, amount) pairs to start with (Default: none)
+        :type moves: list[tuple[str, int]], optional
+        """
+        self.moves: list[tuple[str, int]] = list(moves or [])
+
+    def fd(self, distance: int) -> "Path":
+        """Add a move forward.
+        """
+        self.moves.append(("fd", distance))
+        return self
+
+    def bk(self, distance: int) -> "Path":
+        """Add a move back.
+        """
+        self.moves.append(("bk", distance))
+        return self
+
+    def lt(self, degrees: int) -> "Path":
+        """Add a turn to the left, in the units set by angles().
+        """
+        self.moves.append(("lt", degrees))
+        return self
+
+    def rt(self, degrees: int) -> "Path":
+        """Add a turn to the right, in the units set by angles().
+        """
+        self.moves.append(("rt", degrees))
+        return self
+
+    def extend(self, moves) -> "Path":
+        """Add the moves of another path or list of moves.
+        """
+        self.moves.extend(moves.moves if isinstance(moves, Path) else moves)
+        return self
+
+    def draw(self) -> int:
+        """Run the moves on the current canvas.
+
+        :return: id of the line drawn, or -1 if nothing was drawn
+        :rtype: int
+        """
+        return run_moves(self.moves)
 
 
-@draw
-def _draw_line(x: int, y: int, new_x: int, new_y: int):
-    """Private. Helper class used to draw a line between two points.
+def path(moves=None) -> Path:
+    """Start building a sequence of moves and turns to draw in one go.
+
+    :param moves: the (move, amount) pairs to start with (Default: none)
+    :type moves: list[tuple[str, int]], optional
+    :return: the path, whose fd(), bk(), lt() and rt() methods add moves
+    :rtype: Path
     """
-    return TurtleCanvas._canvas.create_line(
-        (x - TurtleCanvas._origin_x) * TurtleCanvas._x_multiplier,
-        (y - TurtleCanvas._origin_y) * TurtleCanvas._y_multiplier,
-        (new_x - TurtleCanvas._origin_x) * TurtleCanvas._x_multiplier,
-        (new_y - TurtleCanvas._origin_y) * TurtleCanvas._x_multiplier,
-        fill=TurtleCanvas._colour,
-        width=TurtleCanvas._thick * TurtleCanvas._x_multiplier,
-    )
+    return Path(moves)
 
 
 @draw
@@ -530,32 +2927,18 @@ def ellblot(xradius: int, yradius: int) -> int:
 def _oval(xradius: int, yradius: int, border: bool = False, fill: bool = False) -> int:
     """Private. Helper function for drawing elliptical shapes.
     """
-    x1 = (
-        TurtleCanvas._x - xradius - TurtleCanvas._origin_x
-    ) * TurtleCanvas._x_multiplier
-    y1 = (
-        TurtleCanvas._y - yradius - TurtleCanvas._origin_y
-    ) * TurtleCanvas._y_multiplier
-    x2 = (
-        TurtleCanvas._x + xradius - TurtleCanvas._origin_x
-    ) * TurtleCanvas._x_multiplier
-    y2 = (
-        TurtleCanvas._y + yradius - TurtleCanvas._origin_y
-    ) * TurtleCanvas._y_multiplier
+    canvas = _current()
+    coords = (
+        canvas._x - xradius - canvas._origin_x,
+        canvas._y - yradius - canvas._origin_y,
+        canvas._x + xradius - canvas._origin_x,
+        canvas._y + yradius - canvas._origin_y,
+    )
     id = -1
     if border:
-        id = TurtleCanvas._canvas.create_oval(
-            x1,
-            y1,
-            x2,
-            y2,
-            width=TurtleCanvas._thick * TurtleCanvas._x_multiplier,
-            outline=TurtleCanvas._colour,
-        )
+        id = _emit(_OVAL, coords, canvas._colour, canvas._thick)
     if fill:
-        id = TurtleCanvas._canvas.create_oval(
-            x1, y1, x2, y2, width=0, fill=TurtleCanvas._colour
-        )
+        id = _emit(_OVAL, coords, canvas._colour)
     return id
 
 
@@ -569,19 +2952,163 @@ def pixset(x: int, y: int, colour: int) -> int:
     :type y: int
     :param colour: the new colour of the pixel 
     :type colour: int
-    :return: the id of the pixel
+    :return: the id of the pixel, or of the canvas image in raster mode
+    :rtype: int
+    """
+    canvas = _current()
+    return _emit(
+        _PIXEL,
+        (x - canvas._origin_x, y - canvas._origin_y),
+        colour_to_int(colour),
+    )
+
+
+@draw
+def blit(x: int, y: int, w: int, h: int, data) -> int:
+    """Set the colours of a block of w by h pixels with its top left corner at (x, y) in one go.
+
+    :param x: the x coordinate of the top left pixel
+    :type x: int
+    :param y: the y coordinate of the top left pixel
+    :type y: int
+    :param w: the width of the block
+    :type w: int
+    :param h: the height of the block
+    :type h: int
+    :param data: the colours row by row, as packed RGB bytes (3 bytes per pixel) in any
+        object supporting the buffer protocol, or as rgb integers in an ``array('I')``
+        or NumPy array
+    :type data: bytes | bytearray | memoryview | array
+    :return: the id of the image showing the block, or of the canvas image in raster mode
     :rtype: int
     """
-    return TurtleCanvas._canvas.create_rectangle(
-        (x - TurtleCanvas._origin_x) * TurtleCanvas._x_multiplier,
-        (y - TurtleCanvas._origin_y) * TurtleCanvas._y_multiplier,
-        (x - TurtleCanvas._origin_x + 1) * TurtleCanvas._x_multiplier,
-        (y - TurtleCanvas._origin_y + 1) * TurtleCanvas._y_multiplier,
-        fill=colour_to_str(colour),
-        width=0,
+    canvas = _current()
+    rgb, width, height = _to_rgb(data, w)
+    if (width, height) != (w, h):
+        raise ValueError(f"expected a {w}x{h} block of pixels, got {width}x{height}")
+    return _emit(
+        _BLIT,
+        (x - canvas._origin_x, y - canvas._origin_y),
+        0,
+        extra=(bytes(rgb), w, h),
     )
 
 
+def pixset_block(x: int, y: int, colours, width: int | None = None) -> int:
+    """Set the colours of a block of pixels with its top left corner at (x, y) in one go.
+
+    :param x: the x coordinate of the top left pixel
+    :type x: int
+    :param y: the y coordinate of the top left pixel
+    :type y: int
+    :param colours: the colours row by row, as a 2D NumPy array of rgb integers, a 3D
+        NumPy array of RGB bytes, or a flat ``array('I')``, ``bytes`` of packed RGB or
+        list of colours together with ``width``
+    :type colours: array | bytes | list
+    :param width: the width of the block, needed when ``colours`` is flat
+    :type width: int, optional
+    :return: the id of the image showing the block, or of the canvas image in raster mode
+    :rtype: int
+    """
+    rgb, w, h = _to_rgb(colours, width)
+    return blit(x, y, w, h, rgb)
+
+
+def pixset_row(x: int, y: int, colours) -> int:
+    """Set the colours of a row of pixels starting at (x, y) in one go.
+
+    :param x: the x coordinate of the first pixel
+    :type x: int
+    :param y: the y coordinate of the row
+    :type y: int
+    :param colours: the colours from left to right, as an ``array('I')`` or NumPy array of
+        rgb integers, ``bytes`` of packed RGB or a list of colours
+    :type colours: array | bytes | list
+    :return: the id of the image showing the row, or of the canvas image in raster mode
+    :rtype: int
+    """
+    rgb, w, h = _to_rgb(colours)
+    return blit(x, y, w * h, 1, rgb)
+
+
+def render_tiles(
+    func: callable,
+    x: int,
+    y: int,
+    w: int,
+    h: int,
+    workers: int | None = None,
+    tile_size: int = 64,
+    per_tile: bool = False,
+) -> int:
+    """Colour a block of w by h pixels by calling a function for every pixel, on several processes.
+
+    The block is split into square tiles which are computed in parallel and drawn as soon
+    as each one is finished. The function is sent to the worker processes, so it must be
+    defined at the top level of a module (or be a ``functools.partial`` of one) and the
+    program must create its canvas under ``if __name__ == "__main__":``.
+
+    :param func: called as ``func(x, y)`` for every pixel and returning its colour, or as
+        ``func(x, y, w, h)`` for every tile and returning the colours of the tile row by row
+        in any form pixset_block accepts with a width
+    :type func: callable
+    :param x: the x coordinate of the top left pixel
+    :type x: int
+    :param y: the y coordinate of the top left pixel
+    :type y: int
+    :param w: the width of the block
+    :type w: int
+    :param h: the height of the block
+    :type h: int
+    :param workers: the number of processes, 1 computes every tile in this process
+        (Default: the number of CPUs)
+    :type workers: int, optional
+    :param tile_size: the width and height of the tiles (Default: 64)
+    :type tile_size: int
+    :param per_tile: call the function once per tile instead of once per pixel (Default: False)
+    :type per_tile: bool
+    :return: the id of the last tile drawn, or -1 if the block is empty
+    :rtype: int
+    """
+    tiles = [
+        (tx, ty, min(tile_size, x + w - tx), min(tile_size, y + h - ty))
+        for ty in range(y, y + h, tile_size)
+        for tx in range(x, x + w, tile_size)
+    ]
+    id = -1
+    if (workers or os.cpu_count() or 1) == 1:
+        for tile in tiles:
+            id = blit(*_render_tile(func, per_tile, *tile))
+        return id
+    # multiprocessing is slow to import and only needed here
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(_render_tile, func, per_tile, *tile) for tile in tiles]
+        for future in as_completed(futures):
+            id = blit(*future.result())
+    return id
+
+
+def _render_tile(
+    func: callable, per_tile: bool, x: int, y: int, w: int, h: int
+) -> tuple[int, int, int, int, bytes]:
+    """Private. Compute the colours of one tile for render_tiles, in a worker process.
+
+    :return: the arguments of blit for the tile
+    :rtype: tuple[int, int, int, int, bytes]
+    """
+    if per_tile:
+        colours = func(x, y, w, h)
+    else:
+        colours = [func(i, j) for j in range(y, y + h) for i in range(x, x + w)]
+    rgb, width, height = _to_rgb(colours, w)
+    if (width, height) != (w, h):
+        raise ValueError(f"expected a {w}x{h} tile of pixels, got {width}x{height}")
+    # packed RGB is the cheapest form to send back to the canvas process
+    return x, y, w, h, bytes(rgb)
+
+
 @draw
 def box(x: int, y: int, colour: int, border: bool) -> int:
     """Draw a rectangle.
@@ -597,13 +3124,17 @@ def box(x: int, y: int, colour: int, border: bool) -> int:
     :return: id of the shape drawn
     :rtype: int
     """
-    return TurtleCanvas._canvas.create_rectangle(
-        (TurtleCanvas._x - TurtleCanvas._origin_x) * TurtleCanvas._x_multiplier,
-        (TurtleCanvas._y - TurtleCanvas._origin_y) * TurtleCanvas._y_multiplier,
-        (TurtleCanvas._x - TurtleCanvas._origin_x + x) * TurtleCanvas._x_multiplier,
-        (TurtleCanvas._y - TurtleCanvas._origin_y + y) * TurtleCanvas._y_multiplier,
-        fill=colour_to_str(colour),
-        width=int(border) * TurtleCanvas._thick,
+    canvas = _current()
+    return _emit(
+        _RECTANGLE,
+        (
+            canvas._x - canvas._origin_x,
+            canvas._y - canvas._origin_y,
+            canvas._x - canvas._origin_x + x,
+            canvas._y - canvas._origin_y + y,
+        ),
+        colour_to_int(colour),
+        int(border) * canvas._thick,
     )
 
 
@@ -613,11 +3144,16 @@ def polyline(n: int):
 
     :param n: the number of points to consider
     :type n: int
+    :return: id of the line drawn, or -1 if there are no points
+    :rtype: int
     """
-    x, y = TurtleCanvas._x, TurtleCanvas._y
-    for (old_x, old_y) in TurtleCanvas._history[-n:]:
-        _draw_line(x, y, old_x, old_y)
-        x, y = old_x, old_y
+    canvas = _current()
+    coords = array(
+        "f", [canvas._x - canvas._origin_x, canvas._y - canvas._origin_y]
+    ) + canvas._history.coords(n, canvas._origin_x, canvas._origin_y)
+    if len(coords) < 4:
+        return -1
+    return _emit(_LINE, coords, canvas._colour, canvas._thick)
 
 
 @draw
@@ -626,10 +3162,12 @@ def polygon(n: int):
 
     :param n: the number of points in the polygon
     :type n: int
+    :return: id of the shape drawn
+    :rtype: int
     """
-    TurtleCanvas._canvas.create_polygon(
-        *TurtleCanvas._history[-n:], fill=colour_to_str(TurtleCanvas._colour)
-    )
+    canvas = _current()
+    coords = canvas._history.coords(n, canvas._origin_x, canvas._origin_y)
+    return _emit(_POLYGON, coords, canvas._colour)
 
 
 @draw
@@ -645,15 +3183,30 @@ def display(text: str, font: str = "Helvetica", size: int = 12) -> int:
     :return: id of the shape of the text
     :rtype: int
     """
-    t = TurtleCanvas._canvas.create_text(
-        TurtleCanvas._x,
-        TurtleCanvas._y,
-        anchor="nw",
-        font=(f"{font} {size}"),
-        fill=TurtleCanvas._colour,
-        text=text,
+    canvas = _current()
+    return _emit(
+        _TEXT,
+        (canvas._x - canvas._origin_x, canvas._y - canvas._origin_y),
+        canvas._colour,
+        extra=(text, font, size),
     )
-    return t
+
+
+def textwidth(text: str, font: str = "Helvetica", size: int = 12) -> int:
+    """Get the width the text takes up when displayed with display().
+
+    :param text: the text
+    :type text: str
+    :param font: font of the text, defaults to "Helvetica"
+    :type font: str, optional
+    :param size: font size, defaults to 12
+    :type size: int, optional
+    :return: the width of the text in the units of the current resolution
+    :rtype: int
+    """
+    canvas = _current()
+    width, _ = canvas._backend.text_size(str(text), font, size)
+    return round(width / canvas._x_multiplier)
 
 
 @draw
@@ -665,147 +3218,943 @@ def blank(colour) -> int:
     :return: id of the shape of the canvas
     :rtype: int
     """
-    r = TurtleCanvas._canvas.create_rectangle(
-        0,
-        0,
-        TurtleCanvas._width,
-        TurtleCanvas._height,
-        fill=colour_to_str(colour),
-        width=0,
-    )
-    return r
+    return _emit(_CLEAR, (), colour_to_int(colour))
 
 
 @draw
-# If boundry is a negative number, then any colour is acceptable
-def fill(x: int, y: int, boundry: int | str):
-    if boundry.isinstance(str):
+def fill(x: int, y: int, boundry: int | str) -> int:
+    """Flood fill with the turtle's colour, starting from the pixel at the (x, y) coordinates.
+
+    With a negative boundary the region of pixels of the same colour as the starting pixel
+    is filled. Otherwise every pixel up to the boundary colour is filled, whatever its colour.
+
+    :param x: the x coordinate of the starting pixel
+    :type x: int
+    :param y: the y coordinate of the starting pixel
+    :type y: int
+    :param boundry: the colour at which the fill stops, or a negative number
+    :type boundry: int | str
+    :return: id of the shape filled, or -1 if nothing was filled
+    :rtype: int
+    """
+    canvas = _current()
+    if isinstance(boundry, str):
         boundry = colour_to_int(boundry)
-    initcol = pixcol(x, y)
+    colour = canvas._colour
+    w = round(canvas._width / canvas._x_multiplier)
+    h = round(canvas._height / canvas._y_multiplier)
+    x -= canvas._origin_x
+    y -= canvas._origin_y
+    if not (0 <= x < w and 0 <= y < h):
+        return -1
+    rows = [
+        _rgb_to_ints(row)
+        for row in _region_rgb(canvas._origin_x, canvas._origin_y, w, h)
+    ]
+    if boundry < 0:
+        initial = rows[y][x]
+        if initial == colour:
+            return -1
+        fillable = initial.__eq__
+    else:
+        fillable = boundry.__ne__
+    spans = _flood_spans([bytearray(map(fillable, row)) for row in rows], x, y)
+    if not spans:
+        return -1
+    return _emit(_FILL, spans, colour)
+
+
+def _flood_spans(rows: list[bytearray], x: int, y: int) -> list[int]:
+    """Private. Find the pixels connected to (x, y) in a grid, one horizontal span at a time.
+
+    :param rows: one bytearray per row, 1 where a pixel can be filled, cleared as it is
+    :type rows: list[bytearray]
+    :return: flat list of (y, first x, end x) for every span filled
+    :rtype: list[int]
+    """
+    width = len(rows[0])
+    spans = []
+    stack = [(x, y)]
+    while stack:
+        x, y = stack.pop()
+        row = rows[y]
+        if not row[x]:
+            continue
+        # bytearray searches run in C, so a whole span is found in one go
+        left = row.rfind(0, 0, x) + 1
+        right = row.find(0, x)
+        if right < 0:
+            right = width
+        row[left:right] = bytes(right - left)
+        spans += y, left, right
+        for ny in (y - 1, y + 1):
+            if not 0 <= ny < len(rows):
+                continue
+            next_row = rows[ny]
+            # one seed for each run of fillable pixels touching the span
+            i = next_row.find(1, left, right)
+            while i >= 0:
+                stack.append((i, ny))
+                i = next_row.find(0, i, right)
+                if i < 0:
+                    break
+                i = next_row.find(1, i, right)
+    return spans
+
 
 # get information about the canvas
+@counted
 def pixcol(x: int, y: int) -> int:
-    ids = TurtleCanvas._canvas.find_overlapping(
-        (x - TurtleCanvas._origin_x) * TurtleCanvas._x_multiplier,
-        (y - TurtleCanvas._origin_y) * TurtleCanvas._y_multiplier,
-        (x - TurtleCanvas._origin_x + 1) * TurtleCanvas._x_multiplier,
-        (y - TurtleCanvas._origin_y + 1) * TurtleCanvas._y_multiplier,
+    """Get the colour of the pixel at the (x, y) coordinates.
+
+    :param x: the x coordinate of the pixel
+    :type x: int
+    :param y: the y coordinate of the pixel
+    :type y: int
+    :return: the colour of the pixel
+    :rtype: int
+    """
+    canvas = _current()
+    # sample the centre of the pixel, which may span several screen pixels
+    return canvas._backend.colour_at(
+        int((x - canvas._origin_x + 0.5) * canvas._x_multiplier),
+        int((y - canvas._origin_y + 0.5) * canvas._y_multiplier),
+    )
+
+
+@counted
+def pixcol_region(x: int, y: int, w: int, h: int) -> list[list[int]]:
+    """Get the colours of a block of w by h pixels with its top left corner at (x, y).
+
+    :param x: the x coordinate of the top left pixel
+    :type x: int
+    :param y: the y coordinate of the top left pixel
+    :type y: int
+    :param w: the width of the block
+    :type w: int
+    :param h: the height of the block
+    :type h: int
+    :return: one list of colours per row, so that ``pixcol_region(x, y, w, h)[j][i] == pixcol(x + i, y + j)``
+    :rtype: list[list[int]]
+    """
+    if w <= 0 or h <= 0:
+        return []
+    return [
+        _rgb_to_ints(row).tolist() for row in _region_rgb(x, y, w, h)
+    ]
+
+
+def _region_rgb(x: int, y: int, w: int, h: int) -> list[bytes]:
+    """Private. Get a block of pixels as packed RGB bytes, one row at a time.
+    """
+    canvas = _current()
+    return canvas._backend.region_rgb(
+        [
+            int((i - canvas._origin_x + 0.5) * canvas._x_multiplier)
+            for i in range(x, x + w)
+        ],
+        [
+            int((j - canvas._origin_y + 0.5) * canvas._y_multiplier)
+            for j in range(y, y + h)
+        ],
     )
-    if len(ids) == 0:
-        # if no objects overlap, the pixel is white
-        return white
-    for id in reversed(ids):
-        colour = TurtleCanvas._canvas.itemcget(id, "fill")
-        if colour:
-            return colour_to_int(colour)
-    # All items overlapping the pixel are transparent
-    return white
 
 
 def get_key_sym() -> str:
-    return TurtleCanvas._key_sym
+    return _current()._key_sym
 
 
 def get_key_code() -> int:
-    return TurtleCanvas._key_code
+    return _current()._key_code
 
 
 # user interactions
 
-def on_press(event: Event):
-    TurtleCanvas._kshift = 128
+def on_press(event: tkinter.Event, canvas: TurtleCanvas | None = None):
+    canvas = canvas or _current()
+    canvas._kshift = 128
     if event.keysym.startswith("Shift"):
-        TurtleCanvas._kshift += 8
+        canvas._kshift += 8
     elif event.keysym.startswith("Alt"):
-        TurtleCanvas._kshift += 16
+        canvas._kshift += 16
     elif event.keysym.startswith("Control"):
-        TurtleCanvas._kshift += 32
+        canvas._kshift += 32
 
-    if event.type == EventType.Key:
-        TurtleCanvas._key_code = event.keycode
+    if event.type == tkinter.EventType.Key:
+        canvas._key_code = event.keycode
         # This preserves the case for letters and removes the _L and _R from modifiers keys
-        TurtleCanvas._key_sym = event.keysym.split("_")[0]
-        TurtleCanvas._pressed_keys["key"] = TurtleCanvas._kshift
+        canvas._key_sym = event.keysym.split("_")[0]
+        canvas._pressed_keys["key"] = canvas._kshift
     else:
-        TurtleCanvas._key_sym = "mouse" + str(event.num)
-        TurtleCanvas._key_code = 128 + event.num
-        TurtleCanvas._pressed_keys["mouse"] = TurtleCanvas._kshift
-        TurtleCanvas._pressed_keys["clickx"] = event.x
-        TurtleCanvas._pressed_keys["clicky"] = event.y
-        TurtleCanvas._pressed_keys["click"] = TurtleCanvas._key_code
-
-    TurtleCanvas._pressed_keys[TurtleCanvas._key_sym] = TurtleCanvas._kshift
-    TurtleCanvas._pressed_keys["mousekey"] = TurtleCanvas._kshift
-
-
-def on_release(event: Event):
-    if event.type == EventType.KeyRelease:
-        TurtleCanvas._key_code = -event.keycode
+        canvas._key_sym = "mouse" + str(event.num)
+        canvas._key_code = 128 + event.num
+        canvas._pressed_keys["mouse"] = canvas._kshift
+        canvas._pressed_keys["clickx"] = event.x
+        canvas._pressed_keys["clicky"] = event.y
+        canvas._pressed_keys["click"] = canvas._key_code
+
+    canvas._pressed_keys[canvas._key_sym] = canvas._kshift
+    canvas._pressed_keys["mousekey"] = canvas._kshift
+    if canvas._waiting:
+        canvas._backend.notify()
+    for wakeup in canvas._wakeups:
+        wakeup.set()
+
+
+def on_release(event: tkinter.Event, canvas: TurtleCanvas | None = None):
+    canvas = canvas or _current()
+    if event.type == tkinter.EventType.KeyRelease:
+        canvas._key_code = -event.keycode
         keysym = event.keysym.split("_")[0]
-        TurtleCanvas._pressed_keys[keysym] *= -1
-        TurtleCanvas._kshift *= -1
-        TurtleCanvas._pressed_keys["key"] *= -1
+        canvas._pressed_keys[keysym] *= -1
+        canvas._kshift *= -1
+        canvas._pressed_keys["key"] *= -1
     else:
         keysym = "mouse" + str(event.num)
-        TurtleCanvas._pressed_keys[keysym] *= -1
-        TurtleCanvas._pressed_keys["mouse"] *= -1
-        TurtleCanvas._pressed_keys["clickx"] *= -1
-        TurtleCanvas._pressed_keys["clicky"] *= -1
-        TurtleCanvas._pressed_keys["click"] *= -1
-    TurtleCanvas._pressed_keys["mousekey"] *= -1
+        canvas._pressed_keys[keysym] *= -1
+        canvas._pressed_keys["mouse"] *= -1
+        canvas._pressed_keys["clickx"] *= -1
+        canvas._pressed_keys["clicky"] *= -1
+        canvas._pressed_keys["click"] *= -1
+    canvas._pressed_keys["mousekey"] *= -1
+
 
 def detect(key_sym, timeout) -> str:
-    rounds = timeout / 100
-    if timeout == 0:
-        rounds = maxint()
-    status = TurtleCanvas._pressed_keys.get(key_sym, 0)
-    TurtleCanvas._pressed_keys[key_sym] = 0
-    while not TurtleCanvas._pressed_keys.get(key_sym) and rounds > 0:
-        rounds -= 1
-        pause(100)
-    # restore previous status if it timed out
-    if rounds == 0:
-        TurtleCanvas._pressed_keys[key_sym] = status
+    """Wait for a key or mouse button to be pressed.
+
+    :param key_sym: the key sym to wait for, "key" for any key, "mouse" for any mouse
+        button or "mousekey" for either
+    :type key_sym: str
+    :param timeout: the longest time to wait in milliseconds, or 0 to wait for ever
+    :type timeout: int
+    :return: the key sym of the key pressed, or "" if the time ran out
+    :rtype: str
+    """
+    return wait_for(keys=key_sym, timeout=timeout)
+
+
+def wait_for(keys: str | list[str] = (), mouse: bool = False, timeout: int = 0) -> str:
+    """Wait for one of some keys or a mouse button to be pressed.
+
+    The wait handles the events of the canvas as they come, so it ends as soon as the
+    key is pressed, and exactly when the time runs out.
+
+    :param keys: the key sym or key syms to wait for, "key" for any key (Default: none)
+    :type keys: str | list[str]
+    :param mouse: also wait for any mouse button (Default: False)
+    :type mouse: bool
+    :param timeout: the longest time to wait in milliseconds, or 0 to wait for ever (Default: 0)
+    :type timeout: int
+    :return: the key sym of the key or mouse button pressed, or "" if the time ran out
+    :rtype: str
+    """
+    canvas = _current()
+    if canvas._backend.headless:
+        # no keys can be pressed without a window
         return ""
+    keys = (keys,) if isinstance(keys, str) else tuple(keys)
+    if mouse:
+        keys += ("mouse",)
+    statuses = {key: canvas._pressed_keys.get(key, 0) for key in keys}
+    for key in keys:
+        canvas._pressed_keys[key] = 0
+    # show the drawings before waiting
+    canvas.refresh()
+    deadline = perf_counter() + timeout / 1000 if timeout else None
+    canvas._waiting = keys
+    try:
+        while not any(canvas._pressed_keys.get(key) for key in keys):
+            if deadline is None:
+                canvas._backend.wait()
+                continue
+            remaining = (deadline - perf_counter()) * 1000
+            if remaining <= 0:
+                # restore the previous status as it timed out
+                canvas._pressed_keys.update(statuses)
+                return ""
+            canvas._backend.wait(remaining)
+    finally:
+        canvas._waiting = None
     return get_key_sym()
 
 
+async def adetect(key_sym, timeout) -> str:
+    """Wait for a key or mouse button to be pressed without blocking other asyncio tasks.
+
+    :param key_sym: the key sym to wait for, "key" for any key, "mouse" for any mouse
+        button or "mousekey" for either
+    :type key_sym: str
+    :param timeout: the longest time to wait in milliseconds, or 0 to wait for ever
+    :type timeout: int
+    :return: the key sym of the key pressed, or "" if the time ran out
+    :rtype: str
+    """
+    canvas = _current()
+    if canvas._backend.headless:
+        # no keys can be pressed without a window
+        return ""
+    status = canvas._pressed_keys.get(key_sym, 0)
+    canvas._pressed_keys[key_sym] = 0
+    canvas.refresh()
+    _start_pump(canvas)
+    wakeup = asyncio.Event()
+
+    async def pressed():
+        while not canvas._pressed_keys.get(key_sym):
+            # the pump wakes the waiters up when it stops, no key can come after that
+            if canvas._pump.done():
+                raise tkinter.TclError("the window was closed")
+            await wakeup.wait()
+            wakeup.clear()
+
+    canvas._wakeups.add(wakeup)
+    try:
+        await asyncio.wait_for(pressed(), timeout / 1000 if timeout else None)
+    except asyncio.TimeoutError:
+        # restore the previous status as it timed out
+        canvas._pressed_keys[key_sym] = status
+        return ""
+    finally:
+        canvas._wakeups.discard(wakeup)
+    return canvas._key_sym
+
+
+def _start_pump(canvas: TurtleCanvas):
+    """Private. Handle the events of a window from an asyncio task, unless one already does.
+    """
+    if canvas._backend.headless or (canvas._pump and not canvas._pump.done()):
+        return
+    canvas._pump = asyncio.get_running_loop().create_task(_pump_events(canvas))
+
+
+async def _pump_events(canvas: TurtleCanvas):
+    """Private. Handle the events of a window frame_rate times a second until it is closed.
+    """
+    try:
+        while not canvas._backend.closed:
+            # drawings made with noupdate() wait for update()
+            if canvas._update:
+                canvas.refresh()
+            else:
+                canvas._backend.poll()
+            await asyncio.sleep(1 / (canvas._frame_rate or 60))
+    except _window_closed():
+        logging.debug("Window closed")
+    finally:
+        # wake up adetect(), which waits for events only this task handles
+        for wakeup in canvas._wakeups:
+            wakeup.set()
+
+
 # Returns 0 for a key that was never pressed, kshift for one currently pressed and -kshift for one that was released
 def status(key_sym: str):
-    return TurtleCanvas._pressed_keys.get(key_sym, 0)
+    return _current()._pressed_keys.get(key_sym, 0)
 
 
 def reset(key_sym: str):
+    canvas = _current()
     if key_sym == "mousex":
-        TurtleCanvas._mousex = -1
+        canvas._mousex = -1
     elif key_sym == "mousey":
-        TurtleCanvas._mousey = -1
+        canvas._mousey = -1
     else:
-        TurtleCanvas._pressed_keys[key_sym] = 0
+        canvas._pressed_keys[key_sym] = 0
 
 
 # turtle operations
 def new_turtle(arr: list[int]):
-    TurtleCanvas._old_turtle = [
-        TurtleCanvas._x,
-        TurtleCanvas._y,
-        TurtleCanvas._direction,
-        TurtleCanvas._thick,
-        TurtleCanvas._colour,
+    canvas = _current()
+    canvas._old_turtle = [
+        canvas._x,
+        canvas._y,
+        canvas._direction,
+        canvas._thick,
+        canvas._colour,
     ]
-    TurtleCanvas._x = arr[0]
-    TurtleCanvas._y = arr[1]
-    TurtleCanvas._direction = arr[2]
-    TurtleCanvas._thick = arr[3]
-    TurtleCanvas._colour = arr[4]
+    canvas._x = arr[0]
+    canvas._y = arr[1]
+    canvas._direction = arr[2]
+    canvas._thick = arr[3]
+    canvas._colour = colour_to_int(arr[4])
 
 
 def old_turtle():
-    TurtleCanvas._x = TurtleCanvas._old_turtle[0]
-    TurtleCanvas._y = TurtleCanvas._old_turtle[1]
-    TurtleCanvas._direction = TurtleCanvas._old_turtle[2]
-    TurtleCanvas._thick = TurtleCanvas._old_turtle[3]
-    TurtleCanvas._colour = TurtleCanvas._old_turtle[4]
+    canvas = _current()
+    canvas._x = canvas._old_turtle[0]
+    canvas._y = canvas._old_turtle[1]
+    canvas._direction = canvas._old_turtle[2]
+    canvas._thick = canvas._old_turtle[3]
+    canvas._colour = canvas._old_turtle[4]
+
+
+class Turtle:
+    """A turtle of its own, which draws on the canvas without changing the state of the others.
+
+    Its methods work like the functions of the same name, on the turtle's own position,
+    direction, thickness, colour, pen and history of the positions it visited.
+    """
+
+    __slots__ = ("x", "y", "direction", "thick", "colour", "pen", "history")
+
+    def __init__(
+        self,
+        x: float | None = None,
+        y: float | None = None,
+        direction: float = 0,
+        thick: int = 1,
+        colour: tuple[int, int, int] | int | str = black,
+        pen: bool = True,
+    ):
+        """
+        :param x: the x coordinate of the turtle (Default: the x coordinate of home)
+        :type x: float, optional
+        :param y: the y coordinate of the turtle (Default: the y coordinate of home)
+        :type y: float, optional
+        :param direction: the direction the turtle faces, in degrees (Default: 0)
+        :type direction: float
+        :param thick: the thickness of the pen (Default: 1)
+        :type thick: int
+        :param colour: the colour of the pen (Default: black)
+        :type colour: tuple[int, int, int] | int | str
+        :param pen: whether the pen is down (Default: True)
+        :type pen: bool
+        """
+        canvas = _current()
+        self.x = canvas._home[0] if x is None else x
+        self.y = canvas._home[1] if y is None else y
+        self.direction = direction
+        self.thick = thick
+        self.colour = colour_to_int(colour)
+        self.pen = pen
+        self.history = _History()
+
+    def __repr__(self) -> str:
+        return (
+            f"Turtle(x={self.x!r}, y={self.y!r}, direction={self.direction!r}, "
+            f"thick={self.thick!r}, colour={colour_to_str(self.colour)!r}, pen={self.pen!r})"
+        )
+
+    def _run(self, func: callable, *args):
+        """Run a function of the module as this turtle, leaving the canvas turtle as it was.
+        """
+        canvas = _current()
+        saved = (
+            canvas._x,
+            canvas._y,
+            canvas._direction,
+            canvas._thick,
+            canvas._colour,
+            canvas._pen,
+            canvas._history,
+        )
+        (
+            canvas._x,
+            canvas._y,
+            canvas._direction,
+            canvas._thick,
+            canvas._colour,
+            canvas._pen,
+            canvas._history,
+        ) = (
+            self.x,
+            self.y,
+            self.direction,
+            self.thick,
+            self.colour,
+            self.pen,
+            self.history,
+        )
+        try:
+            return func(*args)
+        finally:
+            self.x, self.y = canvas._x, canvas._y
+            self.direction = canvas._direction
+            self.thick = canvas._thick
+            self.colour = canvas._colour
+            self.pen = canvas._pen
+            (
+                canvas._x,
+                canvas._y,
+                canvas._direction,
+                canvas._thick,
+                canvas._colour,
+                canvas._pen,
+                canvas._history,
+            ) = saved
+
+    def forward(self, distance: int) -> int:
+        return self._run(forward, distance)
+
+    def back(self, distance: int) -> int:
+        return self._run(back, distance)
+
+    def left(self, degrees: int):
+        self._run(left, degrees)
+
+    def right(self, degrees: int):
+        self._run(right, degrees)
+
+    def turnxy(self, x: int, y: int):
+        self._run(turnxy, x, y)
+
+    def setxy(self, x: int, y: int):
+        self._run(setxy, x, y)
+
+    def movexy(self, x: int, y: int) -> int:
+        return self._run(movexy, x, y)
+
+    def drawxy(self, x: int, y: int) -> int:
+        return self._run(drawxy, x, y)
+
+    def set_colour(self, new_colour: tuple[int, int, int] | int | str):
+        self.colour = colour_to_int(new_colour)
+
+    def thickness(self, new_thickness: int):
+        self.thick = new_thickness
+
+    def penup(self):
+        self.pen = False
+
+    def pendown(self):
+        self.pen = True
+
+    def blot(self, size: int) -> int:
+        return self._run(blot, size)
+
+    def circle(self, size: int) -> int:
+        return self._run(circle, size)
+
+    def polyline(self, n: int) -> int:
+        return self._run(polyline, n)
+
+    def polygon(self, n: int) -> int:
+        return self._run(polygon, n)
+
+
+def _per_turtle(value, n: int, typecode: str = "d") -> array:
+    """Private. One value for each turtle of a swarm, from a single value or a sequence.
+    """
+    if isinstance(value, (int, float)):
+        return array(typecode, [value]) * n
+    values = array(typecode, value)
+    if len(values) != n:
+        raise ValueError(f"expected {n} values, one for each turtle, got {len(values)}")
+    return values
+
+
+class Swarm:
+    """Many turtles, kept as parallel arrays and moved and drawn all together.
+
+    Each method acts on every turtle at once and takes either one value for all of them
+    or a sequence with one value for each. All the lines drawn by one call are a single
+    drawing, whatever the number of turtles.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        x=None,
+        y=None,
+        direction=0,
+        colour: tuple[int, int, int] | int | str | list = black,
+        thick: int = 1,
+    ):
+        """
+        :param n: the number of turtles
+        :type n: int
+        :param x: the x coordinates of the turtles (Default: the x coordinate of home)
+        :type x: float | list[float], optional
+        :param y: the y coordinates of the turtles (Default: the y coordinate of home)
+        :type y: float | list[float], optional
+        :param direction: the directions the turtles face, in degrees (Default: 0)
+        :type direction: float | list[float]
+        :param colour: the colours of the turtles (Default: black)
+        :type colour: tuple[int, int, int] | int | str | list
+        :param thick: the thickness of the pens of all the turtles (Default: 1)
+        :type thick: int
+        """
+        canvas = _current()
+        self.n = n
+        self.x = _per_turtle(canvas._home[0] if x is None else x, n)
+        self.y = _per_turtle(canvas._home[1] if y is None else y, n)
+        self.direction = _per_turtle(direction, n)
+        self.colours = array("I", [])
+        self.set_colour(colour)
+        self.thick = thick
+        self.pen = True
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i: int) -> Turtle:
+        """Return a copy of the i-th turtle.
+        """
+        return Turtle(
+            self.x[i], self.y[i], self.direction[i], self.thick, self.colours[i], self.pen
+        )
+
+    def set_colour(self, colours: tuple[int, int, int] | int | str | list):
+        """Set the colour of every turtle, or one colour for each turtle.
+        """
+        if isinstance(colours, (int, str, tuple)):
+            colours = [colour_to_int(colours)] * self.n
+        self.colours = _per_turtle(map(colour_to_int, colours), self.n, "I")
+
+    def penup(self):
+        self.pen = False
+
+    def pendown(self):
+        self.pen = True
+
+    def left(self, degrees):
+        """Turn every turtle left, by the same angle or by one angle each.
+        """
+        scale = 360 / _current()._angles
+        self.direction = array(
+            "d",
+            [
+                (d + a * scale) % 360
+                for d, a in zip(self.direction, _per_turtle(degrees, self.n))
+            ],
+        )
+
+    def right(self, degrees):
+        """Turn every turtle right, by the same angle or by one angle each.
+        """
+        if isinstance(degrees, (int, float)):
+            self.left(-degrees)
+        else:
+            self.left([-a for a in degrees])
+
+    def setxy(self, x, y):
+        """Move every turtle to new coordinates without drawing.
+        """
+        self.x = _per_turtle(x, self.n)
+        self.y = _per_turtle(y, self.n)
+
+    def forward(self, distance) -> int:
+        """Move every turtle forward, drawing all their lines at once if the pen is down.
+
+        :param distance: the distance for every turtle, or one distance each
+        :type distance: int | list[int]
+        :return: id of the lines drawn, or -1 if the pen is up
+        :rtype: int
+        """
+        canvas = _current()
+        sin, cos, radians = math.sin, math.cos, math.radians
+        distances = _per_turtle(distance, self.n)
+        new_x = array(
+            "d",
+            [
+                x - d * sin(radians(a))
+                for x, d, a in zip(self.x, distances, self.direction)
+            ],
+        )
+        new_y = array(
+            "d",
+            [
+                y - d * cos(radians(a))
+                for y, d, a in zip(self.y, distances, self.direction)
+            ],
+        )
+        id = -1
+        if self.pen and self.n:
+            ox, oy = canvas._origin_x, canvas._origin_y
+            coords = array("f", bytes(16 * self.n))
+            coords[0::4] = array("f", [x - ox for x in self.x])
+            coords[1::4] = array("f", [y - oy for y in self.y])
+            coords[2::4] = array("f", [x - ox for x in new_x])
+            coords[3::4] = array("f", [y - oy for y in new_y])
+            id = _draw_segments(coords, self.colours, self.thick)
+        self.x, self.y = new_x, new_y
+        return id
+
+    def back(self, distance) -> int:
+        """Move every turtle back, drawing all their lines at once if the pen is down.
+        """
+        if isinstance(distance, (int, float)):
+            return self.forward(-distance)
+        return self.forward([-d for d in distance])
+
+
+@draw
+def _draw_segments(coords: array, colours: array, thick: int) -> int:
+    """Private. Draw separate straight lines, each with its own colour, as one drawing.
+    """
+    return _emit(_SEGMENTS, coords, 0, thick, (colours.tobytes(),))
+
+
+# one table per bit of a byte, to pack and unpack cells 8 to a byte without a loop
+_PACK_TABLES = [bytes((v != 0) << k for v in range(256)) for k in range(8)]
+_UNPACK_TABLES = [bytes((v >> k) & 1 for v in range(256)) for k in range(8)]
+
+
+def _pack_cells(cells: bytes) -> int:
+    """Private. Pack cells, one byte each and alive when not 0, into the bits of an integer.
+    """
+    bits = 0
+    for k in range(8):
+        # the planes have no bits in common, so adding them sets every bit
+        bits += int.from_bytes(cells[k::8].translate(_PACK_TABLES[k]), "little")
+    return bits
+
+
+def _unpack_cells(data: bytes) -> bytearray:
+    """Private. Unpack little-endian bytes of cell bits to one byte, 0 or 1, per cell.
+    """
+    cells = bytearray(len(data) * 8)
+    for k in range(8):
+        cells[k::8] = data.translate(_UNPACK_TABLES[k])
+    return cells
+
+
+def _parse_rule(rule: str) -> tuple[frozenset[int], frozenset[int]]:
+    """Private. The neighbour counts giving birth and survival in a rule like "B3/S23".
+    """
+    try:
+        birth, survival = rule.upper().split("/")
+        if birth[0] != "B" or survival[0] != "S":
+            raise ValueError
+        counts = [frozenset(map(int, part[1:])) for part in (birth, survival)]
+    except (ValueError, IndexError):
+        raise ValueError(f"expected a rule like 'B3/S23', got {rule!r}") from None
+    if any(n > 8 for part in counts for n in part):
+        raise ValueError(f"a cell has at most 8 neighbours, got {rule!r}")
+    return counts[0], counts[1]
+
+
+class Grid:
+    """A grid of cells that live or die by the number of their 8 neighbours alive, like Life.
+
+    The cells are kept as the bits of a single integer, so that every cell of a
+    generation is worked out together by a few shifts and bitwise operations instead of
+    a loop over the cells. Each cell is drawn as one pixel, and only the bands of rows
+    where cells changed since the last draw() are drawn again. Draw on a raster canvas
+    and use resolution() to make the cells bigger.
+    """
+
+    # rows drawn together as one block of pixels
+    band = 16
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        rule: str = "B3/S23",
+        wrap: bool = True,
+        alive: int = black,
+        dead: int = white,
+        x: int = 0,
+        y: int = 0,
+    ):
+        """
+        :param width: number of cells across
+        :type width: int
+        :param height: number of cells down
+        :type height: int
+        :param rule: the numbers of neighbours alive that bring a dead cell to life and
+            keep a live cell alive, as "B" and "S" followed by the numbers (Default: "B3/S23")
+        :type rule: str
+        :param wrap: cells at an edge have the cells at the opposite edge as neighbours
+            (Default: True)
+        :type wrap: bool
+        :param alive: colour of the live cells (Default: black)
+        :type alive: int
+        :param dead: colour of the dead cells (Default: white)
+        :type dead: int
+        :param x: the x coordinate of the top left cell (Default: 0)
+        :type x: int
+        :param y: the y coordinate of the top left cell (Default: 0)
+        :type y: int
+        """
+        self.width = width
+        self.height = height
+        self.birth, self.survival = _parse_rule(rule)
+        self.wrap = wrap
+        self.x, self.y = x, y
+        self.generation = 0
+        self.set_colours(alive, dead)
+        # each row has a dead cell before and after it, so that moving the bits one place
+        # does not carry a cell into the next row; with wrap they copy the opposite edge
+        self._stride = width + 2
+        row = b"\0" + b"\1" * width + b"\0"
+        self._interior = _pack_cells(row * height)
+        self._left = _pack_cells((b"\1" + b"\0" * (width + 1)) * height)
+        self._right = _pack_cells((b"\0" * (width + 1) + b"\1") * height)
+        self._all = (1 << self._stride * height) - 1
+        self._bits = 0
+        # the cells as last drawn, None before the first draw
+        self._shown: int | None = None
+
+    def set_colours(self, alive: int, dead: int):
+        """Set the colours the live and dead cells are drawn in.
+
+        :param alive: colour of the live cells
+        :type alive: int
+        :param dead: colour of the dead cells
+        :type dead: int
+        """
+        self.alive, self.dead = colour_to_int(alive), colour_to_int(dead)
+        # for each channel, the value of a dead (0) and a live (1) cell
+        self._channels = [
+            bytes([(self.dead >> shift) & 255, (self.alive >> shift) & 255]) + bytes(254)
+            for shift in (16, 8, 0)
+        ]
+        self._shown = None
+
+    def _bit(self, x: int, y: int) -> int:
+        """Private. The bit of the cell at (x, y).
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"cell ({x}, {y}) is outside the grid")
+        return 1 << (y * self._stride + x + 1)
+
+    def __getitem__(self, xy: tuple[int, int]) -> bool:
+        return bool(self._bits & self._bit(*xy))
+
+    def __setitem__(self, xy: tuple[int, int], alive: bool):
+        bit = self._bit(*xy)
+        self._bits = self._bits | bit if alive else self._bits & ~bit
+
+    def cells(self) -> bytearray:
+        """Get every cell, row by row.
+
+        :return: one byte for each cell, 1 if it is alive and 0 if not
+        :rtype: bytearray
+        """
+        n = self._stride * self.height
+        padded = _unpack_cells(self._bits.to_bytes((n + 7) // 8, "little"))
+        return bytearray().join(
+            padded[start + 1 : start + 1 + self.width]
+            for start in range(0, n, self._stride)
+        )
+
+    def set_cells(self, cells):
+        """Set every cell, row by row.
+
+        :param cells: one item for each cell, alive when it is not 0, as ``bytes``, a
+            ``bytearray``, a NumPy array of bytes or a list
+        :type cells: bytes | bytearray | list
+        """
+        cells = bytes(cells)
+        if len(cells) != self.width * self.height:
+            raise ValueError(
+                f"expected {self.width * self.height} cells, got {len(cells)}"
+            )
+        padded = b"\0\0".join(
+            cells[start : start + self.width]
+            for start in range(0, len(cells), self.width)
+        )
+        self._bits = _pack_cells(b"\0" + padded + b"\0")
+
+    def randomise(self, density: float = 0.5):
+        """Bring cells to life at random, each with the same chance, and kill the others.
+
+        :param density: the chance of each cell being alive (Default: 0.5)
+        :type density: float
+        """
+        threshold = round(density * 256)
+        alive = bytes(v < threshold for v in range(256))
+        self.set_cells(random.randbytes(self.width * self.height).translate(alive))
+
+    def clear(self):
+        """Kill every cell.
+        """
+        self._bits = 0
+
+    def population(self) -> int:
+        """Count the live cells.
+
+        :return: the number of live cells
+        :rtype: int
+        """
+        return self._bits.bit_count()
+
+    def step(self, generations: int = 1):
+        """Work out the next generations of every cell.
+
+        :param generations: number of generations to go forward (Default: 1)
+        :type generations: int
+        """
+        stride, all_bits = self._stride, self._all
+        last_row = stride * (self.height - 1)
+        # a cell and its neighbours add up to one more than its neighbours when it is alive
+        births = self.birth
+        survivals = {n + 1 for n in self.survival}
+        for _ in range(generations):
+            cells = self._bits
+            if self.wrap:
+                cells |= ((cells >> self.width) & self._left) | (
+                    (cells << self.width) & self._right
+                )
+            # add up each cell and the cells on either side, as 2 bits in 2 integers
+            west, east = cells << 1, cells >> 1
+            row0 = west ^ cells ^ east
+            row1 = (west & cells) | (east & (west ^ cells))
+            # then the rows above and below, as 4 bits of a total from 0 to 9
+            if self.wrap:
+                above0 = ((row0 << stride) | (row0 >> last_row)) & all_bits
+                above1 = ((row1 << stride) | (row1 >> last_row)) & all_bits
+                below0 = (row0 >> stride) | ((row0 << last_row) & all_bits)
+                below1 = (row1 >> stride) | ((row1 << last_row) & all_bits)
+            else:
+                above0, above1 = row0 << stride, row1 << stride
+                below0, below1 = row0 >> stride, row1 >> stride
+            total0 = above0 ^ row0 ^ below0
+            carry = (above0 & row0) | (below0 & (above0 ^ row0))
+            twos = above1 ^ row1 ^ below1
+            fours = (above1 & row1) | (below1 & (above1 ^ row1))
+            total1 = twos ^ carry
+            carry = twos & carry
+            total2 = fours ^ carry
+            total3 = fours & carry
+            totals = (total0, total1, total2, total3)
+            equal = {}
+            for n in births | survivals:
+                match = -1
+                for i, bits in enumerate(totals):
+                    match &= bits if n >> i & 1 else ~bits
+                equal[n] = match
+            born = survive = 0
+            for n in births:
+                born |= equal[n]
+            for n in survivals:
+                survive |= equal[n]
+            self._bits = ((born & ~cells) | (survive & cells)) & self._interior
+        self.generation += generations
+
+    def draw(self) -> int:
+        """Draw the cells that changed since the last time the grid was drawn.
+
+        :return: id of the last block of pixels drawn, or -1 if no cell changed
+        :rtype: int
+        """
+        bits = self._bits
+        changed = self._interior if self._shown is None else bits ^ self._shown
+        self._shown = bits
+        if not changed:
+            return -1
+        stride, width = self._stride, self.width
+        n = stride * self.height
+        data = bits.to_bytes((n + 7) // 8, "little")
+        changes = changed.to_bytes((n + 7) // 8, "little")
+        id = -1
+        for top in range(0, self.height, self.band):
+            bottom = min(top + self.band, self.height)
+            start, end = top * stride // 8, (bottom * stride + 7) // 8
+            if changes.count(0, start, end) == end - start:
+                continue
+            padded = _unpack_cells(data[start:end])
+            first = top * stride - start * 8 + 1
+            cells = bytearray().join(
+                padded[offset : offset + width]
+                for offset in range(first, first + (bottom - top) * stride, stride)
+            )
+            rgb = bytearray(len(cells) * 3)
+            for channel, table in enumerate(self._channels):
+                rgb[channel::3] = cells.translate(table)
+            id = blit(self.x, self.y + top, width, bottom - top, rgb)
+        return id
 
 
 # non-canvas operations
@@ -862,8 +4211,8 @@ def qint(s: str, mult: int, default: int) -> int:
         return default
 
 
-def halt(e: Event = None):
-    TurtleCanvas._canvas.mainloop()
+def halt(e: tkinter.Event = None):
+    _current()._backend.mainloop()
     exit(0)
 
 